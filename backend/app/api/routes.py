@@ -1,6 +1,9 @@
 """API routes for Music Match."""
+import asyncio
 import json
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 from pydantic import BaseModel
 from typing import Optional
 
@@ -8,6 +11,7 @@ from ..db import (
     Song,
     UserProfile,
     get_all_clusters,
+    get_clusters_with_sample_songs,
     get_cluster_by_id,
     get_songs_by_cluster,
     get_song_by_id,
@@ -17,28 +21,44 @@ from ..db import (
     save_song,
     get_cached_features,
     cache_features,
+    cache_features_batch,
+    save_songs_bulk,
+    get_songs_by_spotify_ids,
 )
 from ..quiz import get_questions, calculate_user_vector, get_radar_chart_data
 from ..recommendations import get_recommendations, get_cluster_recommendations
-from ..clustering import reduce_for_visualization, reduce_centroids_for_visualization, FEATURE_COLUMNS
-from ..services import SpotifyService
+from ..clustering import reduce_both_matrix, centroids_to_matrix, FEATURE_COLUMNS
+from ..clustering.cache import (
+    get_song_snapshot,
+    set_song_snapshot,
+    get_centroid_snapshot,
+    set_centroid_snapshot,
+    song_data_version,
+)
+from ..services import SpotifyService, get_spotify_service, TTLCache, get_feature_loader
 from ..feature_extraction import normalize_spotify_features, spotify_features_to_song_dict
-import pandas as pd
+import numpy as np
+
 
+# Time-bounded caches for network-bound Spotify lookups; popular queries
+# dominate traffic so repeats become in-memory hits.
+_search_cache = TTLCache(maxsize=4096, ttl=900)
+_recommendations_cache = TTLCache(maxsize=1024, ttl=900)
 
-# Initialize Spotify service (lazy loading)
-_spotify_service: Optional[SpotifyService] = None
+# Keep references to fire-and-forget tasks so they aren't GC'd mid-flight
+_background_tasks: set = set()
 
 
-def get_spotify_service() -> SpotifyService:
-    """Get or create SpotifyService instance."""
-    global _spotify_service
-    if _spotify_service is None:
-        _spotify_service = SpotifyService()
-    return _spotify_service
+def _run_in_background(coro):
+    """Run a coroutine without blocking the response (e.g. cache writes)."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
-router = APIRouter()
+# orjson serializes large responses (visualization, recommendations)
+# several times faster than the stdlib json encoder
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # Pydantic models for request/response
@@ -58,11 +78,45 @@ class QuizResultResponse(BaseModel):
     songs: list[dict]
 
 
+class BatchImportRequest(BaseModel):
+    track_ids: list[str]
+    cluster_id: Optional[int] = None
+
+
+def _song_from_dict(song_dict: dict, cluster_id: Optional[int] = None) -> Song:
+    """Build a Song model from a spotify_features_to_song_dict result."""
+    return Song(
+        spotify_id=song_dict.get("spotify_id"),
+        title=song_dict.get("title", "Unknown"),
+        artist=song_dict.get("artist", "Unknown"),
+        album=song_dict.get("album", ""),
+        image_url=song_dict.get("image_url"),
+        thumbnail_url=song_dict.get("thumbnail_url"),
+        preview_url=song_dict.get("preview_url"),
+        external_url=song_dict.get("external_url"),
+        duration_ms=song_dict.get("duration_ms", 0),
+        popularity=song_dict.get("popularity", 0),
+        bpm=song_dict.get("bpm", 120.0),
+        energy=song_dict.get("energy", 0.5),
+        danceability=song_dict.get("danceability", 0.5),
+        acousticness=song_dict.get("acousticness", 0.5),
+        valence=song_dict.get("valence", 0.5),
+        instrumentalness=song_dict.get("instrumentalness", 0.5),
+        loudness=song_dict.get("loudness", 0.5),
+        speechiness=song_dict.get("speechiness", 0.0),
+        liveness=song_dict.get("liveness", 0.0),
+        key=song_dict.get("key", "C"),
+        scale=song_dict.get("scale", "major"),
+        cluster_id=cluster_id,
+    )
+
+
 # Quiz routes
 @router.get("/quiz/questions")
 async def get_quiz_questions():
     """Get all quiz questions."""
-    return {"questions": get_questions()}
+    # Static payload; serialize directly and skip the encoder pass
+    return ORJSONResponse({"questions": get_questions()})
 
 
 @router.post("/quiz/submit")
@@ -98,7 +152,9 @@ async def submit_quiz(submission: QuizSubmission):
     # Save to database
     profile_id = await save_user_profile(profile)
 
-    return {
+    # Everything in the payload is already plain dicts and floats, so
+    # serialize directly and skip the encoder pass
+    return ORJSONResponse({
         "user_profile": {
             "id": profile_id,
             "feature_vector": user_vector,
@@ -107,27 +163,102 @@ async def submit_quiz(submission: QuizSubmission):
         "matched_cluster": recommendations.get("matched_cluster"),
         "adjacent_clusters": recommendations.get("adjacent_clusters", []),
         "songs": recommendations.get("songs", [])
-    }
+    })
 
 
 # Cluster routes
-@router.get("/clusters")
+@router.get("/clusters", response_model=None)
 async def get_clusters():
     """Get all clusters with sample songs."""
-    clusters = await get_all_clusters()
+    clusters_with_songs = await get_clusters_with_sample_songs(limit=5)
 
     result = []
-    for cluster in clusters:
-        sample_songs = await get_songs_by_cluster(cluster.id, limit=5)
+    for cluster, sample_songs in clusters_with_songs:
         result.append({
-            **cluster.to_dict(),
-            "sample_songs": [s.to_dict() for s in sample_songs]
+            # Fragment form: the stored centroid JSON is spliced without
+            # a parse/re-serialize roundtrip
+            **cluster.to_fragment_dict(),
+            # orjson serializes the Song dataclasses natively (same keys
+            # as to_dict) without building N intermediate dicts
+            "sample_songs": sample_songs
         })
 
-    return {"clusters": result}
+    # Trusted internal shape; serialize directly and skip the encoder pass
+    return ORJSONResponse({"clusters": result})
+
+
+def _build_feature_arrays(songs: list[Song]):
+    """Build id and (N, 7) float32 feature arrays from Song objects."""
+    if not songs:
+        return None, None
+
+    n = len(songs)
+    ids = np.fromiter((s.id for s in songs), dtype=np.int64, count=n)
+    bpm_normalized = np.fromiter((s.bpm_normalized for s in songs), dtype=np.float64, count=n)
+    energy = np.fromiter((s.energy for s in songs), dtype=np.float64, count=n)
+    danceability = np.fromiter((s.danceability for s in songs), dtype=np.float64, count=n)
+    acousticness = np.fromiter((s.acousticness for s in songs), dtype=np.float64, count=n)
+    valence = np.fromiter((s.valence for s in songs), dtype=np.float64, count=n)
+    instrumentalness = np.fromiter((s.instrumentalness for s in songs), dtype=np.float64, count=n)
+    loudness = np.fromiter((s.loudness for s in songs), dtype=np.float64, count=n)
+
+    X = np.column_stack([
+        bpm_normalized,
+        energy,
+        danceability,
+        acousticness,
+        valence,
+        instrumentalness,
+        loudness,
+    ]).astype(np.float32)
+
+    return ids, X
+
+
+async def _visualization_data():
+    """Project all songs and centroids to 2D for the scatter plot.
+
+    Returns (songs, ids, coords, centroid_coords); songs is empty when
+    the catalog is.
+    """
+    clusters = await get_all_clusters()
 
+    # Songs only change on import/re-clustering; reuse cached arrays
+    snapshot = get_song_snapshot()
+    if snapshot is not None:
+        songs, ids, X = snapshot
+    else:
+        songs = await get_all_songs()
+        ids, X = _build_feature_arrays(songs)
+        set_song_snapshot(songs, ids, X)
 
-@router.get("/clusters/visualization")
+    if not songs:
+        return [], None, None, []
+
+    # Centroids change only on re-clustering; reuse the cached matrix
+    centroid_snapshot = get_centroid_snapshot()
+    if centroid_snapshot is not None:
+        centroid_matrix, centroid_ids = centroid_snapshot
+    else:
+        centroids = []
+        for cluster in clusters:
+            # Copy: the parsed centroid is memoized on the instance
+            centroid = {**cluster.centroid, "cluster_id": cluster.id}
+            centroids.append(centroid)
+        centroid_matrix = centroids_to_matrix(centroids) if centroids else None
+        centroid_ids = [c.id for c in clusters]
+        set_centroid_snapshot(centroid_matrix, centroid_ids)
+
+    # Reduce songs and centroids to 2D with a single PCA fit. The song
+    # version is part of the key so in-place feature updates (same row
+    # count, same max id) still invalidate the cached fit.
+    key = (song_data_version(), len(songs), int(ids.max()))
+    coords, centroid_coords = reduce_both_matrix(X, centroid_matrix, key, centroid_ids)
+
+    return songs, ids, coords, centroid_coords
+
+
+@router.get("/clusters/visualization", response_model=None)
 async def get_clusters_visualization():
     """
     Get 2D coordinates for cluster visualization scatter plot.
@@ -135,63 +266,53 @@ async def get_clusters_visualization():
     Returns all songs with x, y coordinates and cluster assignments,
     plus centroid positions.
     """
-    songs = await get_all_songs()
-    clusters = await get_all_clusters()
+    songs, ids, coords, centroid_coords = await _visualization_data()
 
     if not songs:
-        return {"songs": [], "centroids": []}
-
-    # Build features DataFrame
-    features_data = []
-    for song in songs:
-        features_data.append({
-            "id": song.id,
-            "title": song.title,
-            "artist": song.artist,
-            "cluster_id": song.cluster_id,
-            "bpm_normalized": song.bpm / 200.0,
-            "energy": song.energy,
-            "danceability": song.danceability,
-            "acousticness": song.acousticness,
-            "valence": song.valence,
-            "instrumentalness": song.instrumentalness,
-            "loudness": song.loudness,
-        })
-
-    df = pd.DataFrame(features_data)
+        return ORJSONResponse({"songs": [], "centroids": []})
 
-    # Reduce to 2D
-    coords = reduce_for_visualization(df)
-    df["x"] = coords["x"]
-    df["y"] = coords["y"]
-
-    # Build centroids list
-    centroids = []
-    for cluster in clusters:
-        centroid = cluster.centroid
-        centroid["cluster_id"] = cluster.id
-        centroids.append(centroid)
-
-    # Get centroid coordinates in same PCA space
-    if centroids:
-        centroid_coords = reduce_centroids_for_visualization(centroids, df)
-    else:
-        centroid_coords = []
-
-    return {
+    return ORJSONResponse({
         "songs": [
             {
-                "id": row["id"],
-                "title": row["title"],
-                "artist": row["artist"],
-                "x": float(row["x"]),
-                "y": float(row["y"]),
-                "cluster_id": row["cluster_id"]
+                "id": int(song_id),
+                "title": song.title,
+                "artist": song.artist,
+                "x": float(x),
+                "y": float(y),
+                "cluster_id": song.cluster_id
             }
-            for _, row in df.iterrows()
+            for song_id, song, x, y in zip(ids, songs, coords[:, 0], coords[:, 1])
         ],
         "centroids": centroid_coords
-    }
+    })
+
+
+@router.get("/clusters/visualization/stream")
+async def get_clusters_visualization_stream():
+    """
+    Stream the visualization payload as NDJSON.
+
+    The first line carries the centroids; each following line is one
+    song. Peak memory stays constant regardless of catalog size and
+    the first bytes go out before the full payload is built.
+    """
+    songs, ids, coords, centroid_coords = await _visualization_data()
+
+    def generate():
+        yield orjson.dumps({"centroids": centroid_coords}) + b"\n"
+        if not songs:
+            return
+        for song_id, song, x, y in zip(ids, songs, coords[:, 0], coords[:, 1]):
+            yield orjson.dumps({
+                "id": int(song_id),
+                "title": song.title,
+                "artist": song.artist,
+                "x": float(x),
+                "y": float(y),
+                "cluster_id": song.cluster_id
+            }) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/clusters/{cluster_id}")
@@ -204,10 +325,10 @@ async def get_cluster(cluster_id: int):
 
     songs = await get_songs_by_cluster(cluster_id)
 
-    return {
-        **cluster.to_dict(),
-        "songs": [s.to_dict() for s in songs]
-    }
+    return ORJSONResponse({
+        **cluster.to_fragment_dict(),
+        "songs": songs
+    })
 
 
 # Recommendation routes
@@ -232,7 +353,7 @@ async def get_recommendations_by_cluster(
 
     songs = await get_cluster_recommendations(cluster_id, parsed_vector, limit)
 
-    return {"songs": songs}
+    return ORJSONResponse({"songs": songs})
 
 
 # Song routes
@@ -260,8 +381,16 @@ async def search_spotify_tracks(
     Returns track metadata including album art and preview URLs.
     """
     try:
-        spotify = get_spotify_service()
-        tracks = spotify.search_tracks(q, limit=limit, offset=offset)
+        cache_key = (q.lower().strip(), limit, offset)
+        tracks = _search_cache.get(cache_key)
+
+        if tracks is None:
+            spotify = get_spotify_service()
+            tracks = await asyncio.to_thread(
+                spotify.search_tracks, q, limit=limit, offset=offset
+            )
+            _search_cache.set(cache_key, tracks)
+
         return {"tracks": tracks, "query": q, "limit": limit, "offset": offset}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Spotify search failed: {str(e)}")
@@ -276,7 +405,7 @@ async def get_spotify_track(track_id: str):
     """
     try:
         spotify = get_spotify_service()
-        track = spotify.get_track(track_id)
+        track = await asyncio.to_thread(spotify.get_track, track_id)
 
         if not track:
             raise HTTPException(status_code=404, detail="Track not found")
@@ -307,15 +436,14 @@ async def get_spotify_track_features(track_id: str):
                 "cached": True
             }
 
-        # Fetch from Spotify
-        spotify = get_spotify_service()
-        features = spotify.get_audio_features(track_id)
+        # Fetch from Spotify, coalescing with concurrent requests
+        features = await get_feature_loader().load(track_id)
 
         if not features:
             raise HTTPException(status_code=404, detail="Audio features not found")
 
-        # Cache the features
-        await cache_features(track_id, features)
+        # Cache the features without delaying the response
+        _run_in_background(cache_features(track_id, features))
 
         return {
             "track_id": track_id,
@@ -347,14 +475,14 @@ async def get_spotify_track_with_features(track_id: str):
 
         # Fetch from Spotify
         spotify = get_spotify_service()
-        track_data = spotify.get_track_with_features(track_id)
+        track_data = await asyncio.to_thread(spotify.get_track_with_features, track_id)
 
         if not track_data:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        # Cache features if available
+        # Cache features if available, without delaying the response
         if track_data.get("audio_features"):
-            await cache_features(track_id, track_data["audio_features"])
+            _run_in_background(cache_features(track_id, track_data["audio_features"]))
 
         # Convert to song dict format
         song_data = spotify_features_to_song_dict(
@@ -375,7 +503,7 @@ async def get_spotify_track_with_features(track_id: str):
 
 @router.get("/spotify/recommendations")
 async def get_spotify_recommendations(
-    seed_tracks: str = Query(..., description="Comma-separated track IDs (max 5)"),
+    seed_tracks: str = Query(..., description="Comma-separated track IDs"),
     limit: int = Query(20, ge=1, le=100, description="Number of recommendations"),
     target_energy: Optional[float] = Query(None, ge=0, le=1),
     target_danceability: Optional[float] = Query(None, ge=0, le=1),
@@ -386,8 +514,10 @@ async def get_spotify_recommendations(
     """
     Get Spotify recommendations based on seed tracks.
 
-    Optionally filter by target audio features for more
-    personalized recommendations.
+    Accepts any number of seeds: Spotify caps one call at 5, so larger
+    sets are split into groups of 5 and fetched as a batch. Optionally
+    filter by target audio features for more personalized
+    recommendations.
     """
     try:
         # Parse seed tracks
@@ -396,19 +526,37 @@ async def get_spotify_recommendations(
         if not track_ids:
             raise HTTPException(status_code=400, detail="At least one seed track is required")
 
-        if len(track_ids) > 5:
-            raise HTTPException(status_code=400, detail="Maximum 5 seed tracks allowed")
-
-        spotify = get_spotify_service()
-        tracks = spotify.get_recommendations(
-            seed_tracks=track_ids,
-            limit=limit,
-            target_energy=target_energy,
-            target_danceability=target_danceability,
-            target_valence=target_valence,
-            target_acousticness=target_acousticness,
-            target_instrumentalness=target_instrumentalness,
+        cache_key = (
+            tuple(sorted(track_ids)),
+            limit,
+            target_energy,
+            target_danceability,
+            target_valence,
+            target_acousticness,
+            target_instrumentalness,
         )
+        tracks = _recommendations_cache.get(cache_key)
+
+        if tracks is None:
+            seed_groups = [
+                track_ids[start:start + 5]
+                for start in range(0, len(track_ids), 5)
+            ]
+            spotify = get_spotify_service()
+            tracks = await asyncio.to_thread(
+                spotify.get_recommendations_batch,
+                seed_groups,
+                limit=limit,
+                target_energy=target_energy,
+                target_danceability=target_danceability,
+                target_valence=target_valence,
+                target_acousticness=target_acousticness,
+                target_instrumentalness=target_instrumentalness,
+            )
+            # The merged, de-duplicated batch can exceed the per-group
+            # limit; keep the documented response size
+            tracks = tracks[:limit]
+            _recommendations_cache.set(cache_key, tracks)
 
         return {
             "recommendations": tracks,
@@ -421,6 +569,59 @@ async def get_spotify_recommendations(
         raise HTTPException(status_code=500, detail=f"Failed to get recommendations: {str(e)}")
 
 
+@router.post("/spotify/import/batch")
+async def import_spotify_tracks_batch(request: BatchImportRequest):
+    """
+    Import multiple Spotify tracks in one bulk write.
+
+    Fetches metadata and audio features with batch API calls, then
+    inserts all new songs in a single transaction instead of one
+    commit per track.
+    """
+    try:
+        track_ids = list(dict.fromkeys(t.strip() for t in request.track_ids if t.strip()))
+
+        if not track_ids:
+            raise HTTPException(status_code=400, detail="At least one track ID is required")
+
+        # Skip tracks that are already imported
+        existing_songs = await get_songs_by_spotify_ids(track_ids)
+        existing_ids = {s.spotify_id for s in existing_songs}
+        new_ids = [t for t in track_ids if t not in existing_ids]
+
+        songs = []
+        if new_ids:
+            spotify = get_spotify_service()
+            tracks = await asyncio.to_thread(spotify.get_tracks, new_ids)
+            features_list = await asyncio.to_thread(
+                spotify.get_audio_features_batch, new_ids
+            )
+            features_by_id = {f.get("spotify_id"): f for f in features_list}
+
+            for track in tracks:
+                features = features_by_id.get(track.get("spotify_id"))
+                song_dict = spotify_features_to_song_dict(
+                    track, features, cluster_id=request.cluster_id
+                )
+                songs.append(_song_from_dict(song_dict, request.cluster_id))
+
+            song_ids = await save_songs_bulk(songs)
+            for song, song_id in zip(songs, song_ids):
+                song.id = song_id
+
+            await cache_features_batch(features_list)
+
+        return {
+            "imported": [s.to_dict() for s in songs],
+            "skipped": [s.to_dict() for s in existing_songs],
+            "message": f"Imported {len(songs)} tracks, skipped {len(existing_songs)} existing"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to import tracks: {str(e)}")
+
+
 @router.post("/spotify/import/{track_id}")
 async def import_spotify_track(track_id: str, cluster_id: Optional[int] = None):
     """
@@ -441,7 +642,7 @@ async def import_spotify_track(track_id: str, cluster_id: Optional[int] = None):
 
         # Fetch from Spotify
         spotify = get_spotify_service()
-        track_data = spotify.get_track_with_features(track_id)
+        track_data = await asyncio.to_thread(spotify.get_track_with_features, track_id)
 
         if not track_data:
             raise HTTPException(status_code=404, detail="Track not found on Spotify")
@@ -454,38 +655,15 @@ async def import_spotify_track(track_id: str, cluster_id: Optional[int] = None):
         )
 
         # Create Song object
-        song = Song(
-            spotify_id=song_dict.get("spotify_id"),
-            title=song_dict.get("title", "Unknown"),
-            artist=song_dict.get("artist", "Unknown"),
-            album=song_dict.get("album", ""),
-            image_url=song_dict.get("image_url"),
-            thumbnail_url=song_dict.get("thumbnail_url"),
-            preview_url=song_dict.get("preview_url"),
-            external_url=song_dict.get("external_url"),
-            duration_ms=song_dict.get("duration_ms", 0),
-            popularity=song_dict.get("popularity", 0),
-            bpm=song_dict.get("bpm", 120.0),
-            energy=song_dict.get("energy", 0.5),
-            danceability=song_dict.get("danceability", 0.5),
-            acousticness=song_dict.get("acousticness", 0.5),
-            valence=song_dict.get("valence", 0.5),
-            instrumentalness=song_dict.get("instrumentalness", 0.5),
-            loudness=song_dict.get("loudness", 0.5),
-            speechiness=song_dict.get("speechiness", 0.0),
-            liveness=song_dict.get("liveness", 0.0),
-            key=song_dict.get("key", "C"),
-            scale=song_dict.get("scale", "major"),
-            cluster_id=cluster_id,
-        )
+        song = _song_from_dict(song_dict, cluster_id)
 
         # Save to database
         song_id = await save_song(song)
         song.id = song_id
 
-        # Cache the audio features
+        # Cache the audio features without delaying the response
         if track_data.get("audio_features"):
-            await cache_features(track_id, track_data["audio_features"])
+            _run_in_background(cache_features(track_id, track_data["audio_features"]))
 
         return {
             "song": song.to_dict(),
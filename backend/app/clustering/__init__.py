@@ -5,10 +5,20 @@ from .cluster import (
     find_optimal_k,
     assign_clusters,
     get_cluster_centroids,
+    get_cluster_centroid_matrix,
+    centroids_to_matrix,
     reduce_for_visualization,
     reduce_centroids_for_visualization,
+    reduce_both,
+    reduce_both_matrix,
+    save_models,
+    load_models,
+)
+from .describe import (
+    generate_cluster_description,
+    generate_cluster_descriptions,
+    get_cluster_mood_emoji,
 )
-from .describe import generate_cluster_description, get_cluster_mood_emoji
 
 __all__ = [
     "FEATURE_COLUMNS",
@@ -16,8 +26,15 @@ __all__ = [
     "find_optimal_k",
     "assign_clusters",
     "get_cluster_centroids",
+    "get_cluster_centroid_matrix",
+    "centroids_to_matrix",
     "reduce_for_visualization",
     "reduce_centroids_for_visualization",
+    "reduce_both",
+    "reduce_both_matrix",
+    "save_models",
+    "load_models",
     "generate_cluster_description",
+    "generate_cluster_descriptions",
     "get_cluster_mood_emoji",
 ]
@@ -0,0 +1,87 @@
+"""In-memory cache of song feature arrays for the visualization endpoint.
+
+Songs only change on import or re-clustering, so the per-request
+get_all_songs round-trip and feature-matrix rebuild can be skipped
+between writes. Writers bump the version; the cached snapshot is only
+served while its version matches. Per-process only.
+"""
+from typing import Optional
+
+
+# Bumped on every song-table write; snapshots from older versions are stale
+_version = 0
+_snapshot: Optional[tuple] = None
+
+
+def bump_song_version():
+    """Invalidate cached song arrays after a song-table write."""
+    global _version, _snapshot
+    _version += 1
+    _snapshot = None
+    _cluster_matrices.clear()
+
+
+def song_data_version() -> int:
+    """Current song-data version stamp."""
+    return _version
+
+
+def get_song_snapshot() -> Optional[tuple]:
+    """Get the cached (songs, ids, X) tuple, or None if stale or absent."""
+    if _snapshot is not None and _snapshot[0] == _version:
+        return _snapshot[1]
+    return None
+
+
+def set_song_snapshot(songs, ids, X):
+    """Cache the song list and feature arrays for the current version."""
+    global _snapshot
+    _snapshot = (_version, (songs, ids, X))
+
+
+# Per-cluster unit-normalized song feature matrices for ranking; keyed
+# by cluster_id and valid only at the song version they were built at
+_cluster_matrices: dict = {}
+
+
+def get_cluster_matrix(cluster_id: int):
+    """Get the cached unit feature matrix for a cluster, or None if stale."""
+    entry = _cluster_matrices.get(cluster_id)
+    if entry is not None and entry[0] == _version:
+        return entry[1]
+    return None
+
+
+def set_cluster_matrix(cluster_id: int, matrix):
+    """Cache a cluster's unit feature matrix for the current version."""
+    _cluster_matrices[cluster_id] = (_version, matrix)
+
+
+# Centroids change only on re-clustering; versioned separately from songs
+_cluster_version = 0
+_centroid_snapshot: Optional[tuple] = None
+
+
+def bump_cluster_version():
+    """Invalidate the cached centroid matrix after a cluster write."""
+    global _cluster_version, _centroid_snapshot
+    _cluster_version += 1
+    _centroid_snapshot = None
+
+
+def cluster_data_version() -> int:
+    """Current cluster-data version stamp."""
+    return _cluster_version
+
+
+def get_centroid_snapshot() -> Optional[tuple]:
+    """Get the cached (centroid_matrix, cluster_ids), or None if stale."""
+    if _centroid_snapshot is not None and _centroid_snapshot[0] == _cluster_version:
+        return _centroid_snapshot[1]
+    return None
+
+
+def set_centroid_snapshot(matrix, cluster_ids):
+    """Cache the centroid matrix and cluster IDs for the current version."""
+    global _centroid_snapshot
+    _centroid_snapshot = (_cluster_version, (matrix, cluster_ids))
@@ -1,11 +1,16 @@
 """K-means clustering for music features."""
+import joblib
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
+from pathlib import Path
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_score
 from typing import Optional
 
+from .cache import song_data_version
+
 
 FEATURE_COLUMNS = [
     'bpm_normalized',
@@ -18,55 +23,186 @@ FEATURE_COLUMNS = [
 ]
 
 
-def train_clusters(features_df: pd.DataFrame, n_clusters: int = 8) -> tuple[KMeans, float]:
+# Cache for the fitted visualization PCA, keyed on a fingerprint of the
+# song set so we only refit when the songs actually change.
+_pca_cache: dict = {"key": None, "pca": None}
+
+
+def _song_set_key(features_df: pd.DataFrame) -> tuple:
+    """Fingerprint a song DataFrame for PCA cache lookups.
+
+    Includes the song data version so in-place feature updates (which
+    change neither the row count nor the max id) still invalidate the
+    cached fit.
+    """
+    version = song_data_version()
+    if 'id' in features_df.columns and len(features_df) > 0:
+        return (version, len(features_df), int(features_df['id'].max()))
+    return (version, len(features_df), hash(tuple(features_df.index)))
+
+
+def _get_fitted_pca_matrix(X: np.ndarray, key: tuple) -> PCA:
+    """Get a PCA fitted on a raw feature matrix, reusing the cached fit when possible."""
+    if _pca_cache["key"] == key and _pca_cache["pca"] is not None:
+        return _pca_cache["pca"]
+
+    pca = PCA(n_components=2, random_state=42)
+    pca.fit(X)
+
+    # Keep the projection in float32: halves memory traffic and is
+    # plenty of precision for 2D scatter coordinates
+    pca.components_ = pca.components_.astype(np.float32)
+    pca.mean_ = pca.mean_.astype(np.float32)
+
+    _pca_cache["key"] = key
+    _pca_cache["pca"] = pca
+    return pca
+
+
+def _get_fitted_pca(features_df: pd.DataFrame) -> PCA:
+    """Get a PCA fitted on the song features, reusing the cached fit when possible."""
+    return _get_fitted_pca_matrix(
+        features_df[FEATURE_COLUMNS].values,
+        _song_set_key(features_df)
+    )
+
+
+# Full silhouette is O(N^2); subsample above this many songs
+SILHOUETTE_SAMPLE_SIZE = 5000
+
+# Songs used when sweeping candidate k values
+K_SWEEP_SAMPLE_SIZE = 3000
+
+# Where trained models are persisted between process restarts
+MODEL_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "models.joblib"
+
+
+def save_models(
+    model: Optional[KMeans] = None,
+    pca: Optional[PCA] = None,
+    path: Path = MODEL_CACHE_PATH
+):
+    """
+    Persist trained models so restarts don't refit from scratch.
+
+    Args:
+        model: Trained KMeans model
+        pca: Fitted visualization PCA (defaults to the cached one)
+        path: Destination file
+    """
+    if pca is None:
+        pca = _pca_cache["pca"]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump({
+        "kmeans": model,
+        "pca": pca,
+        "pca_key": _pca_cache["key"],
+    }, path, compress=False)
+
+
+def load_models(path: Path = MODEL_CACHE_PATH) -> Optional[dict]:
+    """
+    Load persisted models, memory-mapped so workers share pages.
+
+    Restores the visualization PCA cache as a side effect.
+
+    Args:
+        path: File written by save_models
+
+    Returns:
+        Dict with "kmeans" and "pca" entries, or None if no file exists
+    """
+    if not path.exists():
+        return None
+
+    models = joblib.load(path, mmap_mode='r')
+
+    if models.get("pca") is not None:
+        _pca_cache["key"] = models.get("pca_key")
+        _pca_cache["pca"] = models["pca"]
+
+    return models
+
+
+def _as_feature_matrix(features) -> np.ndarray:
+    """Coerce a feature DataFrame or ndarray to a float32 (N, 7) matrix.
+
+    Callers that already hold an array (e.g. Song.feature_matrix output)
+    skip the DataFrame wrapper and pandas type inference entirely.
+    """
+    if isinstance(features, pd.DataFrame):
+        return features[FEATURE_COLUMNS].values.astype(np.float32)
+    return np.ascontiguousarray(features, dtype=np.float32)
+
+
+def _silhouette(X: np.ndarray, labels: np.ndarray) -> float:
+    """Silhouette score, subsampled for large song sets."""
+    if len(X) > SILHOUETTE_SAMPLE_SIZE:
+        return float(silhouette_score(
+            X, labels,
+            sample_size=SILHOUETTE_SAMPLE_SIZE,
+            random_state=42
+        ))
+    return float(silhouette_score(X, labels))
+
+
+def train_clusters(features, n_clusters: int = 8) -> tuple[KMeans, float]:
     """
     Train k-means clustering model on song features.
 
     Args:
-        features_df: DataFrame with feature columns
+        features: DataFrame with feature columns, or an (N, 7) array
+            in FEATURE_COLUMNS order
         n_clusters: Number of clusters to create
 
     Returns:
         Tuple of (trained KMeans model, silhouette score)
     """
-    X = features_df[FEATURE_COLUMNS].values
+    X = _as_feature_matrix(features)
 
     model = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
     model.fit(X)
 
-    score = silhouette_score(X, model.labels_)
+    score = _silhouette(X, model.labels_)
     return model, score
 
 
-def find_optimal_k(features_df: pd.DataFrame, k_range: range = range(4, 15)) -> int:
+def _fit_score(X: np.ndarray, k: int) -> float:
+    """Fit one candidate k and return its silhouette (joblib worker)."""
+    model = MiniBatchKMeans(n_clusters=k, random_state=42, n_init=4, batch_size=1024)
+    labels = model.fit_predict(X)
+    return _silhouette(X, labels)
+
+
+def find_optimal_k(features, k_range: range = range(4, 15)) -> int:
     """
     Find optimal number of clusters using silhouette score.
 
+    Candidate k values are fitted in parallel on a subsample with
+    mini-batch k-means; the final model is still trained with full
+    restarts on the full data.
+
     Args:
-        features_df: DataFrame with feature columns
+        features: DataFrame with feature columns, or an (N, 7) array
+            in FEATURE_COLUMNS order
         k_range: Range of k values to try
 
     Returns:
         Optimal number of clusters
     """
-    X = features_df[FEATURE_COLUMNS].values
-
-    best_k = k_range.start
-    best_score = -1
+    X = _as_feature_matrix(features)
 
-    for k in k_range:
-        if k >= len(X):
-            break
+    if len(X) > K_SWEEP_SAMPLE_SIZE:
+        idx = np.random.default_rng(42).choice(len(X), K_SWEEP_SAMPLE_SIZE, replace=False)
+        X = X[idx]
 
-        model = KMeans(n_clusters=k, random_state=42, n_init=10)
-        labels = model.fit_predict(X)
-        score = silhouette_score(X, labels)
+    ks = [k for k in k_range if k < len(X)]
+    if not ks:
+        return k_range.start
 
-        if score > best_score:
-            best_score = score
-            best_k = k
-
-    return best_k
+    scores = Parallel(n_jobs=-1)(delayed(_fit_score)(X, k) for k in ks)
+    return ks[int(np.argmax(scores))]
 
 
 def assign_clusters(model: KMeans, features_df: pd.DataFrame) -> pd.Series:
@@ -104,6 +240,38 @@ def get_cluster_centroids(model: KMeans) -> list[dict]:
     return centroids
 
 
+def get_cluster_centroid_matrix(model: KMeans) -> np.ndarray:
+    """
+    Get cluster centroids as a (K, n_features) float32 matrix.
+
+    SoA counterpart of get_cluster_centroids; row i corresponds to
+    cluster i, columns follow FEATURE_COLUMNS order.
+
+    Args:
+        model: Trained KMeans model
+
+    Returns:
+        Centroid matrix of shape (n_clusters, len(FEATURE_COLUMNS))
+    """
+    return model.cluster_centers_.astype(np.float32)
+
+
+def centroids_to_matrix(centroids: list[dict]) -> np.ndarray:
+    """
+    Convert centroid dicts to a (K, n_features) float32 matrix.
+
+    Args:
+        centroids: List of centroid dictionaries
+
+    Returns:
+        Centroid matrix with columns in FEATURE_COLUMNS order
+    """
+    matrix = np.empty((len(centroids), len(FEATURE_COLUMNS)), dtype=np.float32)
+    for j, col in enumerate(FEATURE_COLUMNS):
+        matrix[:, j] = [c[col] for c in centroids]
+    return matrix
+
+
 def reduce_for_visualization(features_df: pd.DataFrame) -> pd.DataFrame:
     """
     Reduce features to 2D using PCA for visualization.
@@ -114,10 +282,10 @@ def reduce_for_visualization(features_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with x, y coordinates
     """
-    X = features_df[FEATURE_COLUMNS].values
+    X = features_df[FEATURE_COLUMNS].values.astype(np.float32)
 
-    pca = PCA(n_components=2, random_state=42)
-    coords = pca.fit_transform(X)
+    pca = _get_fitted_pca(features_df)
+    coords = _project_2d(X, pca)
 
     return pd.DataFrame({
         'x': coords[:, 0],
@@ -127,7 +295,8 @@ def reduce_for_visualization(features_df: pd.DataFrame) -> pd.DataFrame:
 
 def reduce_centroids_for_visualization(
     centroids: list[dict],
-    features_df: pd.DataFrame
+    features_df: pd.DataFrame,
+    pca: Optional[PCA] = None
 ) -> list[dict]:
     """
     Project centroids to same 2D PCA space as songs.
@@ -135,27 +304,95 @@ def reduce_centroids_for_visualization(
     Args:
         centroids: List of centroid dictionaries
         features_df: DataFrame used for fitting PCA
+        pca: Already-fitted PCA to reuse (looked up from cache if omitted)
 
     Returns:
         List of centroids with x, y coordinates
     """
-    # Fit PCA on song features
-    X = features_df[FEATURE_COLUMNS].values
-    pca = PCA(n_components=2, random_state=42)
-    pca.fit(X)
+    if pca is None:
+        pca = _get_fitted_pca(features_df)
+
+    return _project_centroids(pca, centroids)
+
 
-    # Transform centroids
-    centroid_array = np.array([
-        [c[col] for col in FEATURE_COLUMNS]
-        for c in centroids
-    ])
-    coords = pca.transform(centroid_array)
+def _project_2d(X: np.ndarray, pca: PCA) -> np.ndarray:
+    """Project rows into the fitted 2D PCA space via explicit matmul.
+
+    Equivalent to pca.transform but skips sklearn's validation overhead,
+    which matters for tiny inputs like centroid matrices.
+    """
+    return (X - pca.mean_) @ pca.components_.T
+
+
+def _project_centroids(pca: PCA, centroids, cluster_ids=None) -> list[dict]:
+    """Transform centroids (dicts or a matrix) into the fitted 2D PCA space."""
+    if isinstance(centroids, np.ndarray):
+        centroid_array = centroids
+        if cluster_ids is None:
+            cluster_ids = list(range(len(centroids)))
+    else:
+        centroid_array = centroids_to_matrix(centroids)
+        cluster_ids = [c["cluster_id"] for c in centroids]
+
+    coords = _project_2d(centroid_array, pca)
 
     result = []
-    for i, centroid in enumerate(centroids):
+    for i, cluster_id in enumerate(cluster_ids):
         result.append({
-            "cluster_id": centroid["cluster_id"],
+            "cluster_id": cluster_id,
             "x": float(coords[i, 0]),
             "y": float(coords[i, 1])
         })
     return result
+
+
+def reduce_both(
+    features_df: pd.DataFrame,
+    centroids: list[dict]
+) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Project songs and centroids to 2D with a single PCA fit.
+
+    Args:
+        features_df: DataFrame with feature columns
+        centroids: List of centroid dictionaries
+
+    Returns:
+        Tuple of (song coords DataFrame, centroid coord dicts)
+    """
+    pca = _get_fitted_pca(features_df)
+    song_coords = reduce_for_visualization(features_df)
+
+    centroid_coords = []
+    if centroids:
+        centroid_coords = reduce_centroids_for_visualization(centroids, features_df, pca)
+
+    return song_coords, centroid_coords
+
+
+def reduce_both_matrix(
+    X: np.ndarray,
+    centroids,
+    key: tuple,
+    centroid_ids=None
+) -> tuple[np.ndarray, list[dict]]:
+    """
+    Project a raw feature matrix and centroids to 2D with a single PCA fit.
+
+    Args:
+        X: Feature matrix of shape (n_songs, len(FEATURE_COLUMNS))
+        centroids: Centroid dicts, or a (K, 7) matrix paired with centroid_ids
+        key: Song-set fingerprint for the PCA cache
+        centroid_ids: Cluster IDs matching the rows of a centroid matrix
+
+    Returns:
+        Tuple of (song coords array of shape (n_songs, 2), centroid coord dicts)
+    """
+    pca = _get_fitted_pca_matrix(X, key)
+    coords = _project_2d(X, pca)
+
+    centroid_coords = []
+    if centroids is not None and len(centroids):
+        centroid_coords = _project_centroids(pca, centroids, centroid_ids)
+
+    return coords, centroid_coords
@@ -1,4 +1,107 @@
 """Generate human-readable descriptions for clusters."""
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+
+from .cluster import FEATURE_COLUMNS
+
+
+# Pattern-rule descriptions in cascade priority order; shared between
+# the scalar cascade and the vectorized classifier
+_RULE_DESCRIPTIONS = (
+    "Upbeat party anthems - energetic, danceable, and feel-good tracks",
+    "Intense electronic - driving beats with darker undertones",
+    "Melancholic acoustic - introspective, stripped-back emotional pieces",
+    "Warm acoustic - cozy, feel-good unplugged vibes",
+    "Ambient soundscapes - atmospheric instrumental journeys",
+    "Instrumental energy - dynamic tracks without vocals",
+    "High-octane rock - powerful, intense guitar-driven sound",
+    "Groovy mid-tempo - smooth rhythms perfect for casual listening",
+    "Feel-good favorites - positive vibes without being overwhelming",
+    "Moody and atmospheric - contemplative tracks with depth",
+    "Fast and furious - high-tempo adrenaline rushers",
+    "Slow and steady - relaxed tracks for winding down",
+)
+
+
+# Per-feature threshold breakpoints actually used by the rule cascades.
+# Two centroids falling in the same bucket for every feature take the
+# same path through the rules, so the result can be reused via table
+# dispatch instead of re-running a dozen float comparisons.
+_DESC_BREAKPOINTS = {
+    "energy": (0.3, 0.4, 0.5, 0.6, 0.7),
+    "danceability": (0.5, 0.6, 0.7),
+    "acousticness": (0.3, 0.6, 0.7),
+    "valence": (0.3, 0.4, 0.5, 0.6, 0.7),
+    "instrumentalness": (0.6, 0.7),
+    "loudness": (0.6,),
+    "bpm_normalized": (0.4, 0.7),
+}
+
+_EMOJI_BREAKPOINTS = {
+    "energy": (0.3, 0.4, 0.7),
+    "valence": (0.3, 0.4, 0.6, 0.7),
+    "acousticness": (0.7,),
+    "instrumentalness": (0.7,),
+}
+
+def _bucket(value: float, breakpoints: tuple) -> int:
+    """Map a value to its position among the breakpoints.
+
+    Even indices are the open intervals between breakpoints; odd indices
+    are exact hits, so strict comparisons stay faithful at boundaries.
+    """
+    i = bisect_left(breakpoints, value)
+    if i < len(breakpoints) and breakpoints[i] == value:
+        return 2 * i + 1
+    return 2 * i
+
+
+def _quantize(centroid: dict, breakpoints: dict) -> tuple:
+    """Build the dispatch key for a centroid."""
+    return tuple(
+        _bucket(centroid.get(feature, 0.5), bps)
+        for feature, bps in breakpoints.items()
+    )
+
+
+def _bucket_value(bucket: int, breakpoints: tuple) -> float:
+    """Pick a representative feature value for a bucket index.
+
+    Odd buckets are exact breakpoint hits; even buckets take the
+    interval midpoint (or a value just past the outermost breakpoint),
+    so the representative takes the same path through every comparison
+    as any value in the bucket.
+    """
+    if bucket % 2:
+        return breakpoints[bucket // 2]
+    i = bucket // 2
+    if i == 0:
+        return breakpoints[0] - 0.1
+    if i == len(breakpoints):
+        return breakpoints[-1] + 0.1
+    return (breakpoints[i - 1] + breakpoints[i]) / 2.0
+
+
+@lru_cache(maxsize=4096)
+def _describe_bucketed(key: tuple) -> str:
+    """Run the description cascade for a bucket key (cache-miss path)."""
+    centroid = {
+        feature: _bucket_value(bucket, bps)
+        for (feature, bps), bucket in zip(_DESC_BREAKPOINTS.items(), key)
+    }
+    return _describe(centroid)
+
+
+@lru_cache(maxsize=512)
+def _emoji_bucketed(key: tuple) -> str:
+    """Run the emoji cascade for a bucket key (cache-miss path)."""
+    centroid = {
+        feature: _bucket_value(bucket, bps)
+        for (feature, bps), bucket in zip(_EMOJI_BREAKPOINTS.items(), key)
+    }
+    return _mood_emoji(centroid)
 
 
 def generate_cluster_description(centroid: dict) -> str:
@@ -16,6 +119,11 @@ def generate_cluster_description(centroid: dict) -> str:
     Returns:
         Human-readable description of the cluster
     """
+    return _describe_bucketed(_quantize(centroid, _DESC_BREAKPOINTS))
+
+
+def _describe(centroid: dict) -> str:
+    """Run the full description rule cascade (dispatch-table miss path)."""
     energy = centroid.get("energy", 0.5)
     danceability = centroid.get("danceability", 0.5)
     acousticness = centroid.get("acousticness", 0.5)
@@ -24,56 +132,53 @@ def generate_cluster_description(centroid: dict) -> str:
     loudness = centroid.get("loudness", 0.5)
     bpm = centroid.get("bpm_normalized", 0.5)
 
-    # Define characteristic patterns
-    patterns = []
-
     # High energy + high danceability + high valence = Party
     if energy > 0.7 and danceability > 0.7 and valence > 0.6:
-        return "Upbeat party anthems - energetic, danceable, and feel-good tracks"
+        return _RULE_DESCRIPTIONS[0]
 
     # High energy + high danceability + low valence = Intense dance
     if energy > 0.7 and danceability > 0.6 and valence < 0.4:
-        return "Intense electronic - driving beats with darker undertones"
+        return _RULE_DESCRIPTIONS[1]
 
     # Low energy + high acousticness + low valence = Melancholic acoustic
     if energy < 0.4 and acousticness > 0.6 and valence < 0.4:
-        return "Melancholic acoustic - introspective, stripped-back emotional pieces"
+        return _RULE_DESCRIPTIONS[2]
 
     # Low energy + high acousticness + high valence = Warm acoustic
     if energy < 0.5 and acousticness > 0.6 and valence > 0.5:
-        return "Warm acoustic - cozy, feel-good unplugged vibes"
+        return _RULE_DESCRIPTIONS[3]
 
     # High instrumentalness + low energy = Ambient
     if instrumentalness > 0.7 and energy < 0.4:
-        return "Ambient soundscapes - atmospheric instrumental journeys"
+        return _RULE_DESCRIPTIONS[4]
 
     # High instrumentalness + high energy = Electronic/instrumental
     if instrumentalness > 0.6 and energy > 0.6:
-        return "Instrumental energy - dynamic tracks without vocals"
+        return _RULE_DESCRIPTIONS[5]
 
     # High energy + low danceability + high loudness = Rock/Metal
     if energy > 0.7 and danceability < 0.5 and loudness > 0.6:
-        return "High-octane rock - powerful, intense guitar-driven sound"
+        return _RULE_DESCRIPTIONS[6]
 
     # Medium everything with high danceability = Groovy
     if 0.4 < energy < 0.7 and danceability > 0.6:
-        return "Groovy mid-tempo - smooth rhythms perfect for casual listening"
+        return _RULE_DESCRIPTIONS[7]
 
     # High valence + medium energy = Feel-good
     if valence > 0.7 and 0.4 < energy < 0.7:
-        return "Feel-good favorites - positive vibes without being overwhelming"
+        return _RULE_DESCRIPTIONS[8]
 
     # Low valence + medium energy = Moody
     if valence < 0.3 and 0.4 < energy < 0.7:
-        return "Moody and atmospheric - contemplative tracks with depth"
+        return _RULE_DESCRIPTIONS[9]
 
     # Fast tempo + high energy
     if bpm > 0.7 and energy > 0.6:
-        return "Fast and furious - high-tempo adrenaline rushers"
+        return _RULE_DESCRIPTIONS[10]
 
     # Slow tempo + low energy
     if bpm < 0.4 and energy < 0.4:
-        return "Slow and steady - relaxed tracks for winding down"
+        return _RULE_DESCRIPTIONS[11]
 
     # Build description from individual features
     descriptors = []
@@ -105,6 +210,53 @@ def generate_cluster_description(centroid: dict) -> str:
     return "Balanced mix - versatile tracks spanning multiple styles"
 
 
+def generate_cluster_descriptions(centroids: np.ndarray) -> list[str]:
+    """
+    Describe every cluster at once from a (K, 7) centroid matrix.
+
+    Vectorized counterpart of generate_cluster_description for the
+    re-clustering path: each pattern rule is evaluated as one boolean
+    array comparison across all K centroids, in cascade priority order.
+    Columns follow FEATURE_COLUMNS order.
+
+    Args:
+        centroids: Centroid matrix of shape (n_clusters, 7)
+
+    Returns:
+        List of descriptions, row-aligned with the input
+    """
+    arr = np.asarray(centroids, dtype=np.float64)
+    bpm, energy, dance, acoustic, valence, instr, loud = arr.T
+
+    rule_masks = [
+        (energy > 0.7) & (dance > 0.7) & (valence > 0.6),
+        (energy > 0.7) & (dance > 0.6) & (valence < 0.4),
+        (energy < 0.4) & (acoustic > 0.6) & (valence < 0.4),
+        (energy < 0.5) & (acoustic > 0.6) & (valence > 0.5),
+        (instr > 0.7) & (energy < 0.4),
+        (instr > 0.6) & (energy > 0.6),
+        (energy > 0.7) & (dance < 0.5) & (loud > 0.6),
+        (energy > 0.4) & (energy < 0.7) & (dance > 0.6),
+        (valence > 0.7) & (energy > 0.4) & (energy < 0.7),
+        (valence < 0.3) & (energy > 0.4) & (energy < 0.7),
+        (bpm > 0.7) & (energy > 0.6),
+        (bpm < 0.4) & (energy < 0.4),
+    ]
+
+    # np.select takes the first matching rule per row, resolving the
+    # cascade priority in one fused pass over the masks
+    labels = np.select(rule_masks, list(range(len(rule_masks))), default=-1)
+
+    descriptions = []
+    for i, label in enumerate(labels):
+        if label >= 0:
+            descriptions.append(_RULE_DESCRIPTIONS[label])
+        else:
+            # No pattern rule fired; fall through to the descriptor path
+            descriptions.append(_describe(dict(zip(FEATURE_COLUMNS, arr[i]))))
+    return descriptions
+
+
 def get_cluster_mood_emoji(centroid: dict) -> str:
     """
     Get an emoji representing the cluster mood.
@@ -115,6 +267,11 @@ def get_cluster_mood_emoji(centroid: dict) -> str:
     Returns:
         Emoji string
     """
+    return _emoji_bucketed(_quantize(centroid, _EMOJI_BREAKPOINTS))
+
+
+def _mood_emoji(centroid: dict) -> str:
+    """Run the emoji rule cascade (dispatch-table miss path)."""
     energy = centroid.get("energy", 0.5)
     valence = centroid.get("valence", 0.5)
     acousticness = centroid.get("acousticness", 0.5)
@@ -2,23 +2,33 @@
 from .models import Song, Cluster, UserProfile, SpotifyCache
 from .database import (
     init_db,
+    close_db,
+    transaction,
     get_all_songs,
+    iter_all_songs,
     get_songs_by_cluster,
     get_song_by_id,
     get_song_by_spotify_id,
     save_song_features,
     save_song,
+    save_songs_bulk,
+    get_songs_by_spotify_ids,
     get_all_clusters,
+    get_clusters_with_sample_songs,
     get_cluster_by_id,
     save_cluster,
     clear_clusters,
+    update_cluster_counts,
     update_song_cluster,
+    bulk_update_song_cluster,
     save_user_profile,
     get_user_profile,
     get_cached_features,
     get_cached_features_batch,
     cache_features,
     cache_features_batch,
+    get_extracted_features_batch,
+    cache_extracted_features_batch,
 )
 
 __all__ = [
@@ -27,21 +37,31 @@ __all__ = [
     "UserProfile",
     "SpotifyCache",
     "init_db",
+    "close_db",
+    "transaction",
     "get_all_songs",
+    "iter_all_songs",
     "get_songs_by_cluster",
     "get_song_by_id",
     "get_song_by_spotify_id",
     "save_song_features",
     "save_song",
+    "save_songs_bulk",
+    "get_songs_by_spotify_ids",
     "get_all_clusters",
+    "get_clusters_with_sample_songs",
     "get_cluster_by_id",
     "save_cluster",
     "clear_clusters",
+    "update_cluster_counts",
     "update_song_cluster",
+    "bulk_update_song_cluster",
     "save_user_profile",
     "get_user_profile",
     "get_cached_features",
     "get_cached_features_batch",
     "cache_features",
     "cache_features_batch",
+    "get_extracted_features_batch",
+    "cache_extracted_features_batch",
 ]
@@ -1,356 +1,774 @@
 """Database operations using aiosqlite."""
 import aiosqlite
-import json
+import asyncio
+import orjson
+import sqlite3
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
 from .models import Song, Cluster, UserProfile, SpotifyCache
+from ..clustering.cache import bump_song_version, bump_cluster_version
 
 
-DATABASE_PATH = Path(__file__).parent.parent.parent / "data" / "music_match.db"
+# Resolved once at import so later path operations don't re-stat the
+# intermediate directories or re-walk symlinks
+DATABASE_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "music_match.db"
+
+
+# Set once the data directory is known to exist, so repeat calls skip
+# the mkdir/stat syscall
+_db_dir_ready = False
 
 
 def _get_db_path() -> Path:
-    """Get database path and ensure directory exists."""
-    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    """Get database path, creating its directory on first call."""
+    global _db_dir_ready
+    if not _db_dir_ready:
+        DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _db_dir_ready = True
     return DATABASE_PATH
 
 
-async def init_db():
-    """Initialize database tables."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
+# Keep IN (...) lists under SQLite's default variable limit (999)
+_IN_CHUNK = 900
+
+# Single long-lived connection reused for the process lifetime; opening
+# per call spawns a thread and re-runs connection setup on every query.
+_conn: Optional[aiosqlite.Connection] = None
+_conn_lock = asyncio.Lock()
+
+
+async def _db() -> aiosqlite.Connection:
+    """Get the shared database connection, opening it on first use."""
+    global _conn
+    if _conn is None:
+        async with _conn_lock:
+            if _conn is None:
+                # PARSE_DECLTYPES makes sqlite3 convert TIMESTAMP
+                # columns to datetime in C instead of our converters
+                # calling datetime.fromisoformat per row in Python
+                conn = await aiosqlite.connect(
+                    _get_db_path(),
+                    detect_types=sqlite3.PARSE_DECLTYPES
+                )
+                conn.row_factory = aiosqlite.Row
+                # WAL lets readers run while a writer commits, and
+                # NORMAL synchronous drops the per-commit double fsync
+                # that dominates write-heavy paths like feature caching
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute("PRAGMA synchronous=NORMAL")
+                await conn.execute("PRAGMA wal_autocheckpoint=1000")
+                await conn.execute("PRAGMA temp_store=MEMORY")
+                await conn.execute("PRAGMA foreign_keys=ON")
+                await conn.execute("PRAGMA mmap_size=268435456")
+                await conn.execute("PRAGMA cache_size=-64000")
+                _conn = conn
+    return _conn
+
+
+# True while inside a transaction() block; write helpers defer their
+# commit to the block instead of fsyncing once per call
+_in_txn: ContextVar[bool] = ContextVar("_in_txn", default=False)
+
+# Serializes explicit transactions and multi-statement batch writes on
+# the shared connection (_conn_lock only guards opening it). Without
+# this, two overlapping handlers can issue nested BEGIN IMMEDIATEs or
+# commit each other's half-finished batches.
+_write_lock = asyncio.Lock()
+
+
+@asynccontextmanager
+async def transaction():
+    """Group many writes into one transaction (one commit, one fsync).
+
+    Write helpers called inside the block skip their own commit, so
+    bulk ingestion and re-clustering pay the journal flush once instead
+    of once per row. The write lock is held for the whole block, so
+    concurrent transaction() blocks run one at a time.
+    """
+    db = await _db()
+    async with _write_lock:
+        token = _in_txn.set(True)
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            await db.rollback()
+            raise
+        else:
+            await db.commit()
+        finally:
+            _in_txn.reset(token)
 
-        # Create songs table with Spotify fields
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS songs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                spotify_id TEXT UNIQUE,
-                title TEXT NOT NULL,
-                artist TEXT NOT NULL,
-                album TEXT DEFAULT '',
-                file_path TEXT,
-                image_url TEXT,
-                thumbnail_url TEXT,
-                preview_url TEXT,
-                external_url TEXT,
-                duration_ms INTEGER DEFAULT 0,
-                popularity INTEGER DEFAULT 0,
-                bpm REAL DEFAULT 0,
-                key TEXT DEFAULT '',
-                scale TEXT DEFAULT '',
-                energy REAL DEFAULT 0,
-                danceability REAL DEFAULT 0,
-                acousticness REAL DEFAULT 0,
-                valence REAL DEFAULT 0,
-                instrumentalness REAL DEFAULT 0,
-                loudness REAL DEFAULT 0,
-                speechiness REAL DEFAULT 0,
-                liveness REAL DEFAULT 0,
-                cluster_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (cluster_id) REFERENCES clusters (id)
-            )
-        """)
-
-        # Create index on spotify_id for faster lookups
-        await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_songs_spotify_id ON songs(spotify_id)
-        """)
 
-        # Create clusters table
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS clusters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                centroid_json TEXT NOT NULL,
-                description TEXT DEFAULT '',
-                song_count INTEGER DEFAULT 0
-            )
-        """)
-
-        # Create user_profiles table
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS user_profiles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_vector_json TEXT NOT NULL,
-                matched_cluster_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (matched_cluster_id) REFERENCES clusters (id)
-            )
-        """)
-
-        # Create spotify_cache table for caching audio features
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS spotify_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                spotify_id TEXT UNIQUE NOT NULL,
-                features_json TEXT NOT NULL,
-                cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+@asynccontextmanager
+async def _maybe_transaction():
+    """Join the caller's transaction() block, or open one of our own.
 
-        await db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_spotify_cache_id ON spotify_cache(spotify_id)
-        """)
+    Batch writers use this so they are atomic (and hold the write lock)
+    when called standalone, without double-BEGINning inside an enclosing
+    transaction() block that already holds it.
+    """
+    if _in_txn.get():
+        yield await _db()
+    else:
+        async with transaction() as db:
+            yield db
 
+
+async def _commit(db: aiosqlite.Connection):
+    """Commit now, unless a transaction() block will commit for us."""
+    if not _in_txn.get():
         await db.commit()
 
 
+async def close_db():
+    """Close the shared connection (app shutdown)."""
+    global _conn
+    if _conn is not None:
+        await _conn.close()
+        _conn = None
+
+
+async def init_db():
+    """Initialize database tables."""
+    db = await _db()
+
+    # Create songs table with Spotify fields
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS songs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            spotify_id TEXT UNIQUE,
+            title TEXT NOT NULL,
+            artist TEXT NOT NULL,
+            album TEXT DEFAULT '',
+            file_path TEXT,
+            image_url TEXT,
+            thumbnail_url TEXT,
+            preview_url TEXT,
+            external_url TEXT,
+            duration_ms INTEGER DEFAULT 0,
+            popularity INTEGER DEFAULT 0,
+            bpm REAL DEFAULT 0,
+            bpm_normalized REAL DEFAULT 0,
+            key TEXT DEFAULT '',
+            scale TEXT DEFAULT '',
+            energy REAL DEFAULT 0,
+            danceability REAL DEFAULT 0,
+            acousticness REAL DEFAULT 0,
+            valence REAL DEFAULT 0,
+            instrumentalness REAL DEFAULT 0,
+            loudness REAL DEFAULT 0,
+            speechiness REAL DEFAULT 0,
+            liveness REAL DEFAULT 0,
+            cluster_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (cluster_id) REFERENCES clusters (id)
+        )
+    """)
+
+    # Migration: add bpm_normalized to databases created before it
+    cursor = await db.execute("PRAGMA table_info(songs)")
+    columns = [row[1] for row in await cursor.fetchall()]
+    if "bpm_normalized" not in columns:
+        await db.execute("ALTER TABLE songs ADD COLUMN bpm_normalized REAL DEFAULT 0")
+        await db.execute("UPDATE songs SET bpm_normalized = bpm / 200.0")
+
+    # Create index on spotify_id for faster lookups
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_songs_spotify_id ON songs(spotify_id)
+    """)
+
+    # Composite index matching get_songs_by_cluster's filter and sort,
+    # so the planner walks the index in output order (and LIMIT can
+    # stop after the first rows) instead of sorting into a temp B-tree
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_songs_cluster_pop
+        ON songs(cluster_id, popularity DESC, title)
+    """)
+
+    # Create clusters table; centroid holds the packed float32 BLOB,
+    # centroid_json stays for readability and older rows
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS clusters (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            centroid_json TEXT NOT NULL,
+            centroid BLOB,
+            description TEXT DEFAULT '',
+            song_count INTEGER DEFAULT 0
+        )
+    """)
+
+    # Migration: add the BLOB column to databases created before it
+    cursor = await db.execute("PRAGMA table_info(clusters)")
+    columns = [row[1] for row in await cursor.fetchall()]
+    if "centroid" not in columns:
+        await db.execute("ALTER TABLE clusters ADD COLUMN centroid BLOB")
+
+    # Create user_profiles table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS user_profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature_vector_json TEXT NOT NULL,
+            matched_cluster_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (matched_cluster_id) REFERENCES clusters (id)
+        )
+    """)
+
+    # Create spotify_cache table for caching audio features
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS spotify_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            spotify_id TEXT UNIQUE NOT NULL,
+            features_json TEXT NOT NULL,
+            cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_spotify_cache_id ON spotify_cache(spotify_id)
+    """)
+
+    # Create extraction_cache table keyed by audio content hash, so
+    # re-running extraction skips files whose bytes were seen before
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS extraction_cache (
+            content_hash TEXT PRIMARY KEY,
+            features_json TEXT NOT NULL,
+            cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    await db.commit()
+
+
 async def get_all_songs() -> list[Song]:
     """Get all songs from database."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM songs ORDER BY title")
-        rows = await cursor.fetchall()
-        return [_row_to_song(row) for row in rows]
+    db = await _db()
+    cursor = await db.execute("SELECT * FROM songs ORDER BY title")
+    rows = await cursor.fetchall()
+    return _rows_to_songs(cursor.description, rows)
+
+
+async def iter_all_songs():
+    """Stream all songs row by row instead of materializing the list.
+
+    Keeps peak memory flat for catalog-size scans: raw rows and Song
+    objects are never co-resident, and object construction overlaps
+    SQLite's next-row fetches. Callers needing a list should use
+    get_all_songs.
+    """
+    db = await _db()
+    async with db.execute("SELECT * FROM songs ORDER BY title") as cursor:
+        cursor.arraysize = 512
+        async for row in cursor:
+            yield _row_to_song(row)
 
 
 async def get_songs_by_cluster(cluster_id: int, limit: Optional[int] = None) -> list[Song]:
     """Get songs belonging to a cluster."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        query = "SELECT * FROM songs WHERE cluster_id = ? ORDER BY popularity DESC, title"
-        if limit:
-            query += f" LIMIT {limit}"
-        cursor = await db.execute(query, (cluster_id,))
-        rows = await cursor.fetchall()
-        return [_row_to_song(row) for row in rows]
+    db = await _db()
+    # LIMIT is bound as a parameter (-1 = unlimited) so every call
+    # reuses the same prepared statement regardless of limit value
+    cursor = await db.execute(
+        "SELECT * FROM songs WHERE cluster_id = ? ORDER BY popularity DESC, title LIMIT ?",
+        (cluster_id, limit if limit else -1)
+    )
+    rows = await cursor.fetchall()
+    return _rows_to_songs(cursor.description, rows)
 
 
 async def get_song_by_id(song_id: int) -> Optional[Song]:
     """Get a single song by ID."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM songs WHERE id = ?", (song_id,))
-        row = await cursor.fetchone()
-        return _row_to_song(row) if row else None
+    db = await _db()
+    cursor = await db.execute("SELECT * FROM songs WHERE id = ?", (song_id,))
+    row = await cursor.fetchone()
+    return _row_to_song(row) if row else None
 
 
 async def get_song_by_spotify_id(spotify_id: str) -> Optional[Song]:
     """Get a song by Spotify ID."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM songs WHERE spotify_id = ?", (spotify_id,))
-        row = await cursor.fetchone()
-        return _row_to_song(row) if row else None
+    db = await _db()
+    cursor = await db.execute("SELECT * FROM songs WHERE spotify_id = ?", (spotify_id,))
+    row = await cursor.fetchone()
+    return _row_to_song(row) if row else None
 
 
 async def save_song(song: Song) -> int:
     """Save or update song with all fields including Spotify data."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-
-        # Check if song with this spotify_id already exists
-        if song.spotify_id:
-            cursor = await db.execute(
-                "SELECT id FROM songs WHERE spotify_id = ?",
-                (song.spotify_id,)
-            )
-            existing = await cursor.fetchone()
-            if existing:
-                song.id = existing["id"]
-
-        if song.id:
-            await db.execute("""
-                UPDATE songs SET
-                    spotify_id = ?, title = ?, artist = ?, album = ?, file_path = ?,
-                    image_url = ?, thumbnail_url = ?, preview_url = ?, external_url = ?,
-                    duration_ms = ?, popularity = ?, bpm = ?, key = ?, scale = ?,
-                    energy = ?, danceability = ?, acousticness = ?, valence = ?,
-                    instrumentalness = ?, loudness = ?, speechiness = ?, liveness = ?,
-                    cluster_id = ?
-                WHERE id = ?
-            """, (
-                song.spotify_id, song.title, song.artist, song.album, song.file_path,
-                song.image_url, song.thumbnail_url, song.preview_url, song.external_url,
-                song.duration_ms, song.popularity, song.bpm, song.key, song.scale,
-                song.energy, song.danceability, song.acousticness, song.valence,
-                song.instrumentalness, song.loudness, song.speechiness, song.liveness,
-                song.cluster_id, song.id
-            ))
-            await db.commit()
-            return song.id
-        else:
+    db = await _db()
+
+    if song.id:
+        await db.execute("""
+            UPDATE songs SET
+                spotify_id = ?, title = ?, artist = ?, album = ?, file_path = ?,
+                image_url = ?, thumbnail_url = ?, preview_url = ?, external_url = ?,
+                duration_ms = ?, popularity = ?, bpm = ?, bpm_normalized = ?,
+                key = ?, scale = ?,
+                energy = ?, danceability = ?, acousticness = ?, valence = ?,
+                instrumentalness = ?, loudness = ?, speechiness = ?, liveness = ?,
+                cluster_id = ?
+            WHERE id = ?
+        """, (
+            song.spotify_id, song.title, song.artist, song.album, song.file_path,
+            song.image_url, song.thumbnail_url, song.preview_url, song.external_url,
+            song.duration_ms, song.popularity, song.bpm, song.bpm_normalized,
+            song.key, song.scale,
+            song.energy, song.danceability, song.acousticness, song.valence,
+            song.instrumentalness, song.loudness, song.speechiness, song.liveness,
+            song.cluster_id, song.id
+        ))
+        await _commit(db)
+        bump_song_version()
+        return song.id
+    else:
+        # Atomic upsert: one statement replaces the old SELECT-probe
+        # plus INSERT-or-UPDATE dance (and its race). A NULL spotify_id
+        # never conflicts, so local-file songs insert as before.
+        cursor = await db.execute("""
+            INSERT INTO songs (
+                spotify_id, title, artist, album, file_path,
+                image_url, thumbnail_url, preview_url, external_url,
+                duration_ms, popularity, bpm, bpm_normalized, key, scale,
+                energy, danceability, acousticness, valence,
+                instrumentalness, loudness, speechiness, liveness, cluster_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(spotify_id) DO UPDATE SET
+                title = excluded.title, artist = excluded.artist,
+                album = excluded.album, file_path = excluded.file_path,
+                image_url = excluded.image_url, thumbnail_url = excluded.thumbnail_url,
+                preview_url = excluded.preview_url, external_url = excluded.external_url,
+                duration_ms = excluded.duration_ms, popularity = excluded.popularity,
+                bpm = excluded.bpm, bpm_normalized = excluded.bpm_normalized,
+                key = excluded.key, scale = excluded.scale,
+                energy = excluded.energy, danceability = excluded.danceability,
+                acousticness = excluded.acousticness, valence = excluded.valence,
+                instrumentalness = excluded.instrumentalness, loudness = excluded.loudness,
+                speechiness = excluded.speechiness, liveness = excluded.liveness,
+                cluster_id = excluded.cluster_id
+            RETURNING id
+        """, (
+            song.spotify_id, song.title, song.artist, song.album, song.file_path,
+            song.image_url, song.thumbnail_url, song.preview_url, song.external_url,
+            song.duration_ms, song.popularity, song.bpm, song.bpm_normalized,
+            song.key, song.scale,
+            song.energy, song.danceability, song.acousticness, song.valence,
+            song.instrumentalness, song.loudness, song.speechiness, song.liveness,
+            song.cluster_id
+        ))
+        row = await cursor.fetchone()
+        await _commit(db)
+        bump_song_version()
+        song.id = row["id"]
+        return song.id
+
+
+# Keep legacy function name for backwards compatibility
+save_song_features = save_song
+
+
+async def get_songs_by_spotify_ids(spotify_ids: list[str]) -> list[Song]:
+    """Get songs matching any of the given Spotify IDs."""
+    if not spotify_ids:
+        return []
+
+    db = await _db()
+    songs = []
+    for i in range(0, len(spotify_ids), _IN_CHUNK):
+        chunk = spotify_ids[i:i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cursor = await db.execute(
+            f"SELECT * FROM songs WHERE spotify_id IN ({placeholders})",
+            chunk
+        )
+        rows = await cursor.fetchall()
+        songs.extend(_rows_to_songs(cursor.description, rows))
+    return songs
+
+
+async def save_songs_bulk(songs: list[Song]) -> list[int]:
+    """Insert many songs in a single transaction.
+
+    Avoids per-row commit overhead for playlist-scale imports. Callers
+    are expected to filter out songs that already exist.
+    """
+    if not songs:
+        return []
+
+    song_ids = []
+    async with _maybe_transaction() as db:
+        for song in songs:
             cursor = await db.execute("""
                 INSERT INTO songs (
                     spotify_id, title, artist, album, file_path,
                     image_url, thumbnail_url, preview_url, external_url,
-                    duration_ms, popularity, bpm, key, scale,
+                    duration_ms, popularity, bpm, bpm_normalized, key, scale,
                     energy, danceability, acousticness, valence,
                     instrumentalness, loudness, speechiness, liveness, cluster_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 song.spotify_id, song.title, song.artist, song.album, song.file_path,
                 song.image_url, song.thumbnail_url, song.preview_url, song.external_url,
-                song.duration_ms, song.popularity, song.bpm, song.key, song.scale,
+                song.duration_ms, song.popularity, song.bpm, song.bpm_normalized,
+                song.key, song.scale,
                 song.energy, song.danceability, song.acousticness, song.valence,
                 song.instrumentalness, song.loudness, song.speechiness, song.liveness,
                 song.cluster_id
             ))
-            await db.commit()
-            return cursor.lastrowid
+            song_ids.append(cursor.lastrowid)
 
-
-# Keep legacy function name for backwards compatibility
-save_song_features = save_song
+    bump_song_version()
+    return song_ids
 
 
 async def get_all_clusters() -> list[Cluster]:
     """Get all clusters."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM clusters ORDER BY id")
-        rows = await cursor.fetchall()
-        return [_row_to_cluster(row) for row in rows]
+    db = await _db()
+    cursor = await db.execute("SELECT * FROM clusters ORDER BY id")
+    rows = await cursor.fetchall()
+    return [_row_to_cluster(row) for row in rows]
+
+
+async def get_clusters_with_sample_songs(limit: int = 5) -> list[tuple[Cluster, list[Song]]]:
+    """Get all clusters with their top songs, without per-cluster queries.
+
+    One window-function query fetches the top-N songs of every cluster
+    at once instead of issuing one query per cluster.
+    """
+    db = await _db()
+
+    cursor = await db.execute("SELECT * FROM clusters ORDER BY id")
+    clusters = [_row_to_cluster(row) for row in await cursor.fetchall()]
+
+    cursor = await db.execute("""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY cluster_id ORDER BY popularity DESC, title
+            ) AS rn
+            FROM songs
+            WHERE cluster_id IS NOT NULL
+        ) WHERE rn <= ?
+        ORDER BY cluster_id, rn
+    """, (limit,))
+    rows = await cursor.fetchall()
+    songs = _rows_to_songs(cursor.description, rows)
+
+    songs_by_cluster: dict[int, list[Song]] = {}
+    for song in songs:
+        songs_by_cluster.setdefault(song.cluster_id, []).append(song)
+
+    return [(cluster, songs_by_cluster.get(cluster.id, [])) for cluster in clusters]
 
 
 async def get_cluster_by_id(cluster_id: int) -> Optional[Cluster]:
     """Get a single cluster by ID."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM clusters WHERE id = ?", (cluster_id,))
-        row = await cursor.fetchone()
-        return _row_to_cluster(row) if row else None
+    db = await _db()
+    cursor = await db.execute("SELECT * FROM clusters WHERE id = ?", (cluster_id,))
+    row = await cursor.fetchone()
+    return _row_to_cluster(row) if row else None
 
 
 async def save_cluster(cluster: Cluster) -> int:
     """Save or update cluster."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        if cluster.id:
-            await db.execute("""
-                UPDATE clusters SET centroid_json = ?, description = ?, song_count = ?
-                WHERE id = ?
-            """, (cluster.centroid_json, cluster.description, cluster.song_count, cluster.id))
-            await db.commit()
-            return cluster.id
-        else:
-            cursor = await db.execute("""
-                INSERT INTO clusters (centroid_json, description, song_count)
-                VALUES (?, ?, ?)
-            """, (cluster.centroid_json, cluster.description, cluster.song_count))
-            await db.commit()
-            return cursor.lastrowid
+    db = await _db()
+    if cluster.id:
+        await db.execute("""
+            UPDATE clusters SET centroid_json = ?, centroid = ?, description = ?, song_count = ?
+            WHERE id = ?
+        """, (
+            cluster.centroid_json, cluster.pack_centroid(),
+            cluster.description, cluster.song_count, cluster.id
+        ))
+        await _commit(db)
+        bump_cluster_version()
+        return cluster.id
+    else:
+        cursor = await db.execute("""
+            INSERT INTO clusters (centroid_json, centroid, description, song_count)
+            VALUES (?, ?, ?, ?)
+        """, (
+            cluster.centroid_json, cluster.pack_centroid(),
+            cluster.description, cluster.song_count
+        ))
+        await _commit(db)
+        bump_cluster_version()
+        return cursor.lastrowid
 
 
 async def clear_clusters():
     """Clear all clusters and reset song cluster assignments."""
-    async with aiosqlite.connect(_get_db_path()) as db:
+    async with _maybe_transaction() as db:
         await db.execute("DELETE FROM clusters")
         await db.execute("UPDATE songs SET cluster_id = NULL")
-        await db.commit()
+    bump_song_version()
+    bump_cluster_version()
+
+
+async def update_cluster_counts():
+    """Recompute every cluster's song_count with one correlated UPDATE.
+
+    Replaces the fetch-then-save round-trip pair per cluster after
+    assignment: SQLite counts per cluster itself off the cluster_id
+    index.
+    """
+    db = await _db()
+    await db.execute("""
+        UPDATE clusters SET song_count = (
+            SELECT COUNT(*) FROM songs WHERE songs.cluster_id = clusters.id
+        )
+    """)
+    await _commit(db)
+    bump_cluster_version()
 
 
 async def update_song_cluster(song_id: int, cluster_id: int):
     """Update song's cluster assignment."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        await db.execute(
+    db = await _db()
+    await db.execute(
+        "UPDATE songs SET cluster_id = ? WHERE id = ?",
+        (cluster_id, song_id)
+    )
+    await _commit(db)
+    bump_song_version()
+
+
+async def bulk_update_song_cluster(pairs: list[tuple[int, int]]):
+    """Update cluster assignments for many songs at once.
+
+    One executemany in a single transaction: re-clustering the whole
+    catalog costs one SQL parse and one commit instead of N.
+
+    Args:
+        pairs: (song_id, cluster_id) tuples
+    """
+    if not pairs:
+        return
+
+    async with _maybe_transaction() as db:
+        await db.executemany(
             "UPDATE songs SET cluster_id = ? WHERE id = ?",
-            (cluster_id, song_id)
+            [(cluster_id, song_id) for song_id, cluster_id in pairs]
         )
-        await db.commit()
+    bump_song_version()
 
 
 async def save_user_profile(profile: UserProfile) -> int:
     """Save user profile."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        cursor = await db.execute("""
-            INSERT INTO user_profiles (feature_vector_json, matched_cluster_id)
-            VALUES (?, ?)
-        """, (profile.feature_vector_json, profile.matched_cluster_id))
-        await db.commit()
-        return cursor.lastrowid
+    db = await _db()
+    cursor = await db.execute("""
+        INSERT INTO user_profiles (feature_vector_json, matched_cluster_id)
+        VALUES (?, ?)
+    """, (profile.feature_vector_json, profile.matched_cluster_id))
+    await _commit(db)
+    return cursor.lastrowid
 
 
 async def get_user_profile(profile_id: int) -> Optional[UserProfile]:
     """Get user profile by ID."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            "SELECT * FROM user_profiles WHERE id = ?",
-            (profile_id,)
-        )
-        row = await cursor.fetchone()
-        return _row_to_user_profile(row) if row else None
+    db = await _db()
+    cursor = await db.execute(
+        "SELECT * FROM user_profiles WHERE id = ?",
+        (profile_id,)
+    )
+    row = await cursor.fetchone()
+    return _row_to_user_profile(row) if row else None
 
 
 # Spotify cache functions
+def _dumps(obj) -> str:
+    """Compact JSON encode; orjson emits minimal separators by default."""
+    return orjson.dumps(obj).decode()
+
+
+_CACHE_UPSERT_SQL = """
+    INSERT OR REPLACE INTO spotify_cache (spotify_id, features_json, cached_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+"""
+
+
 async def get_cached_features(spotify_id: str) -> Optional[dict]:
     """Get cached audio features for a Spotify track."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            "SELECT features_json FROM spotify_cache WHERE spotify_id = ?",
-            (spotify_id,)
-        )
-        row = await cursor.fetchone()
-        if row:
-            return json.loads(row["features_json"])
-        return None
+    cached = await get_cached_features_batch([spotify_id])
+    return cached.get(spotify_id)
 
 
 async def get_cached_features_batch(spotify_ids: list[str]) -> dict[str, dict]:
-    """Get cached audio features for multiple Spotify tracks."""
+    """Get cached audio features for multiple Spotify tracks.
+
+    One indexed IN-list scan per chunk of 900 IDs (SQLite caps bound
+    variables at 999) instead of one query per track.
+    """
     if not spotify_ids:
         return {}
 
-    async with aiosqlite.connect(_get_db_path()) as db:
-        db.row_factory = aiosqlite.Row
-        placeholders = ",".join("?" * len(spotify_ids))
+    db = await _db()
+    cached: dict[str, dict] = {}
+    for i in range(0, len(spotify_ids), _IN_CHUNK):
+        chunk = spotify_ids[i:i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
         cursor = await db.execute(
             f"SELECT spotify_id, features_json FROM spotify_cache WHERE spotify_id IN ({placeholders})",
-            spotify_ids
+            chunk
         )
         rows = await cursor.fetchall()
-        return {
-            row["spotify_id"]: json.loads(row["features_json"])
-            for row in rows
-        }
+        for row in rows:
+            cached[row["spotify_id"]] = orjson.loads(row["features_json"])
+    return cached
 
 
 async def cache_features(spotify_id: str, features: dict):
     """Cache audio features for a Spotify track."""
-    async with aiosqlite.connect(_get_db_path()) as db:
-        await db.execute("""
-            INSERT OR REPLACE INTO spotify_cache (spotify_id, features_json, cached_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        """, (spotify_id, json.dumps(features)))
-        await db.commit()
+    db = await _db()
+    await db.execute(_CACHE_UPSERT_SQL, (spotify_id, _dumps(features)))
+    await _commit(db)
 
 
 async def cache_features_batch(features_list: list[dict]):
-    """Cache audio features for multiple Spotify tracks."""
-    if not features_list:
+    """Cache audio features for multiple Spotify tracks.
+
+    One executemany inside a single transaction: the statement is parsed
+    once and the writer thread is crossed once regardless of batch size.
+    """
+    params = [
+        (features["spotify_id"], _dumps(features))
+        for features in features_list
+        if features.get("spotify_id")
+    ]
+    if not params:
         return
 
-    async with aiosqlite.connect(_get_db_path()) as db:
-        for features in features_list:
-            spotify_id = features.get("spotify_id")
-            if spotify_id:
-                await db.execute("""
-                    INSERT OR REPLACE INTO spotify_cache (spotify_id, features_json, cached_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                """, (spotify_id, json.dumps(features)))
-        await db.commit()
+    async with _maybe_transaction() as db:
+        await db.executemany(_CACHE_UPSERT_SQL, params)
+
+
+_EXTRACTION_UPSERT_SQL = """
+    INSERT OR REPLACE INTO extraction_cache (content_hash, features_json, cached_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+async def get_extracted_features_batch(content_hashes: list[str]) -> dict[str, dict]:
+    """Get cached extraction results for audio content hashes."""
+    db = await _db()
+    cached: dict[str, dict] = {}
+    for i in range(0, len(content_hashes), _IN_CHUNK):
+        chunk = content_hashes[i:i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cursor = await db.execute(
+            f"SELECT content_hash, features_json FROM extraction_cache "
+            f"WHERE content_hash IN ({placeholders})",
+            chunk
+        )
+        rows = await cursor.fetchall()
+        for row in rows:
+            cached[row["content_hash"]] = orjson.loads(row["features_json"])
+    return cached
+
+
+async def cache_extracted_features_batch(entries: list[tuple[str, dict]]):
+    """Cache extraction results keyed by content hash, one transaction."""
+    if not entries:
+        return
+
+    params = [(content_hash, _dumps(features)) for content_hash, features in entries]
+    async with _maybe_transaction() as db:
+        await db.executemany(_EXTRACTION_UPSERT_SQL, params)
+
+
+def _rows_to_songs(description, rows) -> list[Song]:
+    """Convert fetched rows to Songs with column indexes resolved once.
+
+    For catalog-size fetches, indexes are resolved from
+    cursor.description a single time and rows indexed positionally,
+    skipping per-row column-name hashing.
+    """
+    cols = {d[0]: i for i, d in enumerate(description)}
+    c_id = cols["id"]
+    c_spotify = cols["spotify_id"]
+    c_title = cols["title"]
+    c_artist = cols["artist"]
+    c_album = cols["album"]
+    c_file = cols["file_path"]
+    c_image = cols["image_url"]
+    c_thumb = cols["thumbnail_url"]
+    c_preview = cols["preview_url"]
+    c_external = cols["external_url"]
+    c_duration = cols["duration_ms"]
+    c_popularity = cols["popularity"]
+    c_bpm = cols["bpm"]
+    c_bpm_norm = cols["bpm_normalized"]
+    c_key = cols["key"]
+    c_scale = cols["scale"]
+    c_energy = cols["energy"]
+    c_dance = cols["danceability"]
+    c_acoustic = cols["acousticness"]
+    c_valence = cols["valence"]
+    c_instr = cols["instrumentalness"]
+    c_loud = cols["loudness"]
+    c_speech = cols["speechiness"]
+    c_live = cols["liveness"]
+    c_cluster = cols["cluster_id"]
+    c_created = cols["created_at"]
+
+    # One shared fallback timestamp for the whole batch
+    now = datetime.utcnow()
+    songs = []
+    for row in rows:
+        created = row[c_created]
+        songs.append(Song(
+            id=row[c_id],
+            spotify_id=row[c_spotify],
+            title=row[c_title],
+            artist=row[c_artist],
+            album=row[c_album],
+            file_path=row[c_file] or "",
+            image_url=row[c_image],
+            thumbnail_url=row[c_thumb],
+            preview_url=row[c_preview],
+            external_url=row[c_external],
+            duration_ms=row[c_duration],
+            popularity=row[c_popularity],
+            bpm=row[c_bpm] or 0.0,
+            bpm_normalized=row[c_bpm_norm] or 0.0,
+            key=row[c_key] or "",
+            scale=row[c_scale] or "",
+            energy=row[c_energy] or 0.0,
+            danceability=row[c_dance] or 0.0,
+            acousticness=row[c_acoustic] or 0.0,
+            valence=row[c_valence] or 0.0,
+            instrumentalness=row[c_instr] or 0.0,
+            loudness=row[c_loud] or 0.0,
+            speechiness=row[c_speech] or 0.0,
+            liveness=row[c_live] or 0.0,
+            cluster_id=row[c_cluster],
+            created_at=created if created else now,
+        ))
+    return songs
 
 
 def _row_to_song(row: aiosqlite.Row) -> Song:
     """Convert database row to Song model."""
+    # Schema is authoritative: init_db guarantees every column below
+    # exists, so no Row.keys() membership checks are needed
     return Song(
         id=row["id"],
-        spotify_id=row["spotify_id"] if "spotify_id" in row.keys() else None,
+        spotify_id=row["spotify_id"],
         title=row["title"],
         artist=row["artist"],
-        album=row["album"] if "album" in row.keys() else "",
+        album=row["album"],
         file_path=row["file_path"] or "",
-        image_url=row["image_url"] if "image_url" in row.keys() else None,
-        thumbnail_url=row["thumbnail_url"] if "thumbnail_url" in row.keys() else None,
-        preview_url=row["preview_url"] if "preview_url" in row.keys() else None,
-        external_url=row["external_url"] if "external_url" in row.keys() else None,
-        duration_ms=row["duration_ms"] if "duration_ms" in row.keys() else 0,
-        popularity=row["popularity"] if "popularity" in row.keys() else 0,
+        image_url=row["image_url"],
+        thumbnail_url=row["thumbnail_url"],
+        preview_url=row["preview_url"],
+        external_url=row["external_url"],
+        duration_ms=row["duration_ms"],
+        popularity=row["popularity"],
         bpm=row["bpm"] or 0.0,
+        bpm_normalized=row["bpm_normalized"] or 0.0,
         key=row["key"] or "",
         scale=row["scale"] or "",
         energy=row["energy"] or 0.0,
@@ -359,10 +777,10 @@ def _row_to_song(row: aiosqlite.Row) -> Song:
         valence=row["valence"] or 0.0,
         instrumentalness=row["instrumentalness"] or 0.0,
         loudness=row["loudness"] or 0.0,
-        speechiness=row["speechiness"] if "speechiness" in row.keys() else 0.0,
-        liveness=row["liveness"] if "liveness" in row.keys() else 0.0,
+        speechiness=row["speechiness"] or 0.0,
+        liveness=row["liveness"] or 0.0,
         cluster_id=row["cluster_id"],
-        created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
+        created_at=row["created_at"] or datetime.utcnow(),
     )
 
 
@@ -371,6 +789,7 @@ def _row_to_cluster(row: aiosqlite.Row) -> Cluster:
     return Cluster(
         id=row["id"],
         centroid_json=row["centroid_json"],
+        centroid_blob=row["centroid"],
         description=row["description"] or "",
         song_count=row["song_count"] or 0,
     )
@@ -382,5 +801,5 @@ def _row_to_user_profile(row: aiosqlite.Row) -> UserProfile:
         id=row["id"],
         feature_vector_json=row["feature_vector_json"],
         matched_cluster_id=row["matched_cluster_id"],
-        created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
+        created_at=row["created_at"] or datetime.utcnow(),
     )
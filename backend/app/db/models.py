@@ -1,9 +1,37 @@
 """Database models for Music Match."""
-import json
+import orjson
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
+
+
+@lru_cache(maxsize=4096)
+def _isoformat(dt: Optional[datetime]) -> Optional[str]:
+    """ISO-format a timestamp, caching repeats.
+
+    Rows created in the same bulk insert share one timestamp, so
+    serializing a large listing hits the cache instead of re-running
+    isoformat per song.
+    """
+    return dt.isoformat() if dt else None
+
+
+# Fixed centroid feature order for the packed BLOB representation;
+# mirrors clustering.FEATURE_COLUMNS (kept local so models stay free of
+# the heavyweight clustering imports)
+CENTROID_FEATURES = (
+    "bpm_normalized",
+    "energy",
+    "danceability",
+    "acousticness",
+    "valence",
+    "instrumentalness",
+    "loudness",
+)
+
 
 @dataclass
 class Song:
@@ -21,6 +49,7 @@ class Song:
     duration_ms: int = 0
     popularity: int = 0
     bpm: float = 0.0
+    bpm_normalized: float = 0.0
     key: str = ""
     scale: str = ""
     energy: float = 0.0
@@ -34,6 +63,11 @@ class Song:
     cluster_id: Optional[int] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
 
+    def __post_init__(self):
+        # Derive the stored normalization when callers only set raw BPM
+        if not self.bpm_normalized and self.bpm:
+            self.bpm_normalized = self.bpm / 200.0
+
     def to_dict(self) -> dict:
         """Convert song to dictionary."""
         return {
@@ -50,6 +84,7 @@ class Song:
             "duration_ms": self.duration_ms,
             "popularity": self.popularity,
             "bpm": self.bpm,
+            "bpm_normalized": self.bpm_normalized,
             "key": self.key,
             "scale": self.scale,
             "energy": self.energy,
@@ -61,13 +96,13 @@ class Song:
             "speechiness": self.speechiness,
             "liveness": self.liveness,
             "cluster_id": self.cluster_id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": _isoformat(self.created_at),
         }
 
     def get_feature_vector(self) -> list[float]:
         """Get normalized feature vector for clustering."""
         return [
-            self.bpm / 200.0,  # Normalize BPM (assuming max 200)
+            self.bpm_normalized,
             self.energy,
             self.danceability,
             self.acousticness,
@@ -76,6 +111,26 @@ class Song:
             self.loudness,
         ]
 
+    @classmethod
+    def feature_matrix(cls, songs: list["Song"]) -> np.ndarray:
+        """
+        Stack feature vectors for many songs into an (N, 7) float32 matrix.
+
+        One contiguous allocation in CENTROID_FEATURES order instead of
+        a small Python list per song; downstream clustering and
+        similarity code is NumPy-native.
+        """
+        n_features = len(CENTROID_FEATURES)
+        return np.fromiter(
+            (
+                getattr(song, name)
+                for song in songs
+                for name in CENTROID_FEATURES
+            ),
+            dtype=np.float32,
+            count=len(songs) * n_features,
+        ).reshape(-1, n_features)
+
 
 @dataclass
 class Cluster:
@@ -84,16 +139,67 @@ class Cluster:
     centroid_json: str = "{}"
     description: str = ""
     song_count: int = 0
+    # Packed 7 x float32 centroid; preferred over the JSON text because
+    # decoding is a zero-parse frombuffer instead of json.loads
+    centroid_blob: Optional[bytes] = None
+    # Memoized parse of the centroid; treated as read-only by callers
+    _centroid_cache: Optional[dict] = field(default=None, repr=False, compare=False)
 
     @property
     def centroid(self) -> dict:
-        """Parse centroid JSON."""
-        return json.loads(self.centroid_json)
+        """Centroid as a feature dict (parsed once, then memoized)."""
+        if self._centroid_cache is None:
+            if self.centroid_blob:
+                self._centroid_cache = dict(
+                    zip(CENTROID_FEATURES, self.centroid_array.tolist())
+                )
+            else:
+                self._centroid_cache = orjson.loads(self.centroid_json)
+        return self._centroid_cache
 
     @centroid.setter
-    def centroid(self, value: dict):
-        """Set centroid from dict."""
-        self.centroid_json = json.dumps(value)
+    def centroid(self, value: "dict | np.ndarray"):
+        """Set centroid from a dict or an ndarray in CENTROID_FEATURES order.
+
+        Keeps BLOB, JSON, and cache in sync. ndarrays are serialized by
+        orjson natively (OPT_SERIALIZE_NUMPY), skipping a tolist() of
+        boxed floats on the encode path.
+        """
+        if isinstance(value, np.ndarray):
+            self.centroid_blob = np.ascontiguousarray(value, dtype=np.float32).tobytes()
+            self.centroid_json = orjson.dumps(
+                dict(zip(CENTROID_FEATURES, value)),
+                option=orjson.OPT_SERIALIZE_NUMPY,
+            ).decode()
+            # Rebuilt lazily from the blob on first read
+            self._centroid_cache = None
+            return
+
+        self.centroid_json = orjson.dumps(
+            value, option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+        self.centroid_blob = np.asarray(
+            [value.get(key, 0.0) for key in CENTROID_FEATURES],
+            dtype=np.float32
+        ).tobytes()
+        self._centroid_cache = value
+
+    @property
+    def centroid_array(self) -> np.ndarray:
+        """Centroid as a float32 array in CENTROID_FEATURES order."""
+        if self.centroid_blob:
+            return np.frombuffer(self.centroid_blob, dtype=np.float32)
+        centroid = orjson.loads(self.centroid_json)
+        return np.asarray(
+            [centroid.get(key, 0.0) for key in CENTROID_FEATURES],
+            dtype=np.float32
+        )
+
+    def pack_centroid(self) -> Optional[bytes]:
+        """Get the BLOB form, deriving it from JSON if needed."""
+        if self.centroid_blob is None and self.centroid_json != "{}":
+            self.centroid_blob = self.centroid_array.tobytes()
+        return self.centroid_blob
 
     def to_dict(self) -> dict:
         """Convert cluster to dictionary."""
@@ -104,6 +210,21 @@ class Cluster:
             "song_count": self.song_count,
         }
 
+    def to_fragment_dict(self) -> dict:
+        """to_dict for payloads that go straight to orjson.
+
+        The stored centroid JSON is wrapped in orjson.Fragment so the
+        serializer splices it verbatim instead of parse-then-reserialize.
+        The "centroid" value is not a dict; only hand this to
+        orjson.dumps / ORJSONResponse.
+        """
+        return {
+            "id": self.id,
+            "centroid": orjson.Fragment(self.centroid_json.encode()),
+            "description": self.description,
+            "song_count": self.song_count,
+        }
+
 
 @dataclass
 class UserProfile:
@@ -112,16 +233,24 @@ class UserProfile:
     feature_vector_json: str = "{}"
     matched_cluster_id: Optional[int] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
+    _feature_vector_cache: Optional[dict] = field(default=None, repr=False, compare=False)
 
     @property
     def feature_vector(self) -> dict:
-        """Parse feature vector JSON."""
-        return json.loads(self.feature_vector_json)
+        """Feature vector dict (parsed once, then memoized)."""
+        if self._feature_vector_cache is None:
+            self._feature_vector_cache = orjson.loads(self.feature_vector_json)
+        return self._feature_vector_cache
 
     @feature_vector.setter
-    def feature_vector(self, value: dict):
-        """Set feature vector from dict."""
-        self.feature_vector_json = json.dumps(value)
+    def feature_vector(self, value: "dict | np.ndarray"):
+        """Set feature vector from a dict or an ndarray in CENTROID_FEATURES order."""
+        if isinstance(value, np.ndarray):
+            value = dict(zip(CENTROID_FEATURES, value.tolist()))
+        self.feature_vector_json = orjson.dumps(
+            value, option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+        self._feature_vector_cache = value
 
     def to_dict(self) -> dict:
         """Convert user profile to dictionary."""
@@ -129,7 +258,20 @@ class UserProfile:
             "id": self.id,
             "feature_vector": self.feature_vector,
             "matched_cluster_id": self.matched_cluster_id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": _isoformat(self.created_at),
+        }
+
+    def to_fragment_dict(self) -> dict:
+        """to_dict for payloads that go straight to orjson.
+
+        The stored feature-vector JSON is spliced verbatim via
+        orjson.Fragment; only hand this to orjson.dumps / ORJSONResponse.
+        """
+        return {
+            "id": self.id,
+            "feature_vector": orjson.Fragment(self.feature_vector_json.encode()),
+            "matched_cluster_id": self.matched_cluster_id,
+            "created_at": _isoformat(self.created_at),
         }
 
 
@@ -140,13 +282,17 @@ class SpotifyCache:
     spotify_id: str = ""
     features_json: str = "{}"
     cached_at: datetime = field(default_factory=datetime.utcnow)
+    _features_cache: Optional[dict] = field(default=None, repr=False, compare=False)
 
     @property
     def features(self) -> dict:
-        """Parse features JSON."""
-        return json.loads(self.features_json)
+        """Features dict (parsed once, then memoized)."""
+        if self._features_cache is None:
+            self._features_cache = orjson.loads(self.features_json)
+        return self._features_cache
 
     @features.setter
     def features(self, value: dict):
         """Set features from dict."""
-        self.features_json = json.dumps(value)
+        self.features_json = orjson.dumps(value).decode()
+        self._features_cache = value
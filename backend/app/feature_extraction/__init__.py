@@ -1,9 +1,17 @@
 """Audio feature extraction module."""
 from .extract import extract_features, normalize_bpm, ESSENTIA_AVAILABLE
 from .batch_extract import batch_extract_features, get_audio_files, parse_filename
-from .normalize import FeatureScaler, normalize_feature, normalize_loudness
+from .normalize import (
+    FeatureScaler,
+    normalize_feature,
+    normalize_loudness,
+    normalize_feature_batch,
+    normalize_bpm_batch,
+    normalize_loudness_batch,
+)
 from .spotify_features import (
     normalize_spotify_features,
+    normalize_spotify_features_batch,
     spotify_features_to_song_dict,
     get_feature_vector,
     KEY_NAMES,
@@ -21,8 +29,12 @@ __all__ = [
     "FeatureScaler",
     "normalize_feature",
     "normalize_loudness",
+    "normalize_feature_batch",
+    "normalize_bpm_batch",
+    "normalize_loudness_batch",
     # Spotify features
     "normalize_spotify_features",
+    "normalize_spotify_features_batch",
     "spotify_features_to_song_dict",
     "get_feature_vector",
     "KEY_NAMES",
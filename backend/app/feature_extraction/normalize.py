@@ -12,6 +12,27 @@ class FeatureScaler:
         self.min_values: dict[str, float] = {}
         self.max_values: dict[str, float] = {}
         self.fitted = False
+        self._keys: list[str] = []
+        self._key_index: dict[str, int] = {}
+        self._min_arr: Optional[np.ndarray] = None
+        self._range_arr: Optional[np.ndarray] = None
+
+    def _build_matrix(self, features_list: list[dict]) -> np.ndarray:
+        """Stack feature dicts into an (N, K) matrix over self._keys.
+
+        Missing or non-numeric entries become NaN so column reductions
+        can ignore them, matching the scalar per-key filtering.
+        """
+        n, k = len(features_list), len(self._keys)
+        return np.fromiter(
+            (
+                value if isinstance(value := features.get(key), (int, float)) else np.nan
+                for features in features_list
+                for key in self._keys
+            ),
+            dtype=np.float64,
+            count=n * k,
+        ).reshape(n, k)
 
     def fit(self, features_list: list[dict]) -> "FeatureScaler":
         """
@@ -30,13 +51,23 @@ class FeatureScaler:
         keys = set()
         for features in features_list:
             keys.update(features.keys())
+        self._keys = sorted(keys)
+        self._key_index = {key: j for j, key in enumerate(self._keys)}
 
-        # Calculate min/max for each feature
-        for key in keys:
-            values = [f.get(key, 0) for f in features_list if isinstance(f.get(key), (int, float))]
-            if values:
-                self.min_values[key] = min(values)
-                self.max_values[key] = max(values)
+        # Column-wise min/max in one C-level pass, ignoring NaN slots
+        X = self._build_matrix(features_list)
+        valid = ~np.isnan(X)
+        has_values = valid.any(axis=0)
+        mins = np.min(np.where(valid, X, np.inf), axis=0)
+        maxs = np.max(np.where(valid, X, -np.inf), axis=0)
+
+        for j, key in enumerate(self._keys):
+            if has_values[j]:
+                self.min_values[key] = float(mins[j])
+                self.max_values[key] = float(maxs[j])
+
+        self._min_arr = np.where(has_values, mins, 0.0)
+        self._range_arr = np.where(has_values, maxs - mins, 0.0)
 
         self.fitted = True
         return self
@@ -80,7 +111,30 @@ class FeatureScaler:
             List of normalized feature dictionaries
         """
         self.fit(features_list)
-        return [self.transform(f) for f in features_list]
+        if not features_list:
+            return []
+
+        # Normalize the whole batch with one broadcast expression; the
+        # per-dict loop below only unpacks rows back into dicts
+        X = self._build_matrix(features_list)
+        with np.errstate(invalid="ignore"):
+            normalized_matrix = np.where(
+                self._range_arr > 0,
+                (X - self._min_arr) / self._range_arr,
+                0.5,
+            )
+
+        results = []
+        for i, features in enumerate(features_list):
+            normalized = {}
+            for key, value in features.items():
+                j = self._key_index[key]
+                if np.isnan(X[i, j]):
+                    normalized[key] = value
+                else:
+                    normalized[key] = float(normalized_matrix[i, j])
+            results.append(normalized)
+        return results
 
     def save(self, filepath: Path):
         """Save scaler parameters to file."""
@@ -150,3 +204,47 @@ def normalize_loudness(loudness_db: float, min_db: float = -60, max_db: float =
         Normalized loudness value
     """
     return normalize_feature(loudness_db, min_db, max_db)
+
+
+def normalize_feature_batch(
+    values: np.ndarray,
+    min_val: float,
+    max_val: float
+) -> np.ndarray:
+    """
+    Normalize an array of feature values to 0-1 in one pass.
+
+    Vector counterpart of normalize_feature for callers that already
+    hold a batch (e.g. all tempos from one Spotify response).
+
+    Args:
+        values: Array (or sequence) of feature values
+        min_val: Minimum expected value
+        max_val: Maximum expected value
+
+    Returns:
+        float32 array of normalized values between 0 and 1
+    """
+    values = np.asarray(values, dtype=np.float32)
+    if max_val - min_val <= 0:
+        return np.full(values.shape, 0.5, dtype=np.float32)
+
+    return np.clip((values - min_val) / (max_val - min_val), 0.0, 1.0)
+
+
+def normalize_bpm_batch(
+    bpms: np.ndarray,
+    min_bpm: float = 40,
+    max_bpm: float = 200
+) -> np.ndarray:
+    """Normalize an array of BPM values to 0-1."""
+    return normalize_feature_batch(bpms, min_bpm, max_bpm)
+
+
+def normalize_loudness_batch(
+    loudness_db: np.ndarray,
+    min_db: float = -60,
+    max_db: float = 0
+) -> np.ndarray:
+    """Normalize an array of loudness values (dB) to 0-1."""
+    return normalize_feature_batch(loudness_db, min_db, max_db)
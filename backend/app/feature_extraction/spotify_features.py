@@ -1,10 +1,16 @@
 """Feature extraction and normalization for Spotify audio features."""
 from typing import Optional
 
+import numpy as np
+
 
 # Key mapping: Spotify uses 0-11 for C, C#, D, etc.
 KEY_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 
+# Object array over KEY_NAMES so key lookups clamp-and-index instead of
+# branching; also enables fancy indexing in the batched path
+_KEY_TABLE = np.array(KEY_NAMES, dtype=object)
+
 
 def normalize_spotify_features(spotify_features: dict) -> dict:
     """
@@ -30,9 +36,10 @@ def normalize_spotify_features(spotify_features: dict) -> dict:
     loudness_db = spotify_features.get("loudness", -10)
     loudness_normalized = min(1.0, max(0.0, (loudness_db + 60) / 60))
 
-    # Convert key number to name
-    key_num = spotify_features.get("key", 0)
-    key_name = KEY_NAMES[key_num] if 0 <= key_num < 12 else "C"
+    # Convert key number to name (clamped: Spotify reports -1 for "no
+    # key detected", which lands on C like before)
+    key_num = int(spotify_features.get("key", 0))
+    key_name = _KEY_TABLE[min(max(key_num, 0), 11)]
 
     # Convert mode to scale
     mode = spotify_features.get("mode", 1)
@@ -60,6 +67,68 @@ def normalize_spotify_features(spotify_features: dict) -> dict:
     }
 
 
+def normalize_spotify_features_batch(features_list: list[dict]) -> list[dict]:
+    """
+    Normalize a batch of Spotify audio features in one NumPy pass.
+
+    Equivalent to mapping normalize_spotify_features over the list, but
+    the tempo/loudness clamps run as single clipped array expressions
+    instead of per-track Python arithmetic. A Spotify response carries
+    up to 100 tracks, so the batch path amortizes the dispatch cost.
+
+    Args:
+        features_list: Raw Spotify audio feature dicts
+
+    Returns:
+        List of normalized feature dicts, aligned with the input
+    """
+    if not features_list:
+        return []
+
+    n = len(features_list)
+
+    def _column(key: str, default: float) -> np.ndarray:
+        return np.fromiter(
+            (f.get(key, default) for f in features_list),
+            dtype=np.float64,
+            count=n,
+        )
+
+    tempos = _column("tempo", 120)
+    loudness_db = _column("loudness", -10)
+    bpm_normalized = np.clip((tempos - 40) / 160, 0.0, 1.0)
+    loudness_normalized = np.clip((loudness_db + 60) / 60, 0.0, 1.0)
+
+    key_nums = _column("key", 0).astype(np.int64)
+    key_names = _KEY_TABLE[np.clip(key_nums, 0, 11)].tolist()
+    modes = _column("mode", 1)
+    scales = np.where(modes == 1, "major", "minor").tolist()
+
+    bpm_normalized = bpm_normalized.tolist()
+    loudness_normalized = loudness_normalized.tolist()
+    tempos = tempos.tolist()
+    loudness_db = loudness_db.tolist()
+
+    return [
+        {
+            "bpm_normalized": bpm_normalized[i],
+            "energy": features.get("energy", 0.5),
+            "danceability": features.get("danceability", 0.5),
+            "acousticness": features.get("acousticness", 0.5),
+            "valence": features.get("valence", 0.5),
+            "instrumentalness": features.get("instrumentalness", 0.5),
+            "loudness": loudness_normalized[i],
+            "speechiness": features.get("speechiness", 0),
+            "liveness": features.get("liveness", 0),
+            "bpm": tempos[i],
+            "key": key_names[i],
+            "scale": scales[i],
+            "loudness_db": loudness_db[i],
+        }
+        for i, features in enumerate(features_list)
+    ]
+
+
 def spotify_features_to_song_dict(
     track: dict,
     audio_features: Optional[dict] = None,
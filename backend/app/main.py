@@ -4,7 +4,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api import router
-from .db import init_db
+from .clustering import load_models
+from .db import init_db, close_db
+from .services import close_spotify_service
 
 
 @asynccontextmanager
@@ -12,7 +14,12 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Initialize database on startup
     await init_db()
+    # Reuse persisted clustering models instead of refitting per process
+    load_models()
     yield
+    # Release the shared database connection and the Spotify HTTP session
+    await close_db()
+    close_spotify_service()
 
 
 app = FastAPI(
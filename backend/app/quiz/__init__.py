@@ -1,5 +1,5 @@
 """Quiz module."""
-from .questions import QUIZ_QUESTIONS, get_questions, get_question_by_id
+from .questions import QUIZ_QUESTIONS, get_questions, get_question_by_id, get_option_by_id
 from .scoring import (
     FEATURE_KEYS,
     calculate_user_vector,
@@ -12,6 +12,7 @@ __all__ = [
     "QUIZ_QUESTIONS",
     "get_questions",
     "get_question_by_id",
+    "get_option_by_id",
     "FEATURE_KEYS",
     "calculate_user_vector",
     "vector_to_array",
@@ -323,24 +323,39 @@ QUIZ_QUESTIONS = [
 ]
 
 
-def get_questions() -> list[dict]:
+# O(1) lookup tables over the static question data, built once at import
+_QUESTIONS_BY_ID = {q["id"]: q for q in QUIZ_QUESTIONS}
+_OPTIONS_BY_QID = {
+    q["id"]: {opt["id"]: opt for opt in q["options"]}
+    for q in QUIZ_QUESTIONS
+}
+
+# Client-facing view (weights stripped), built once; tuples keep the
+# shared structure read-only
+_PUBLIC_QUESTIONS = tuple(
+    {
+        "id": q["id"],
+        "question": q["question"],
+        "options": tuple(
+            {"id": opt["id"], "text": opt["text"]}
+            for opt in q["options"]
+        )
+    }
+    for q in QUIZ_QUESTIONS
+)
+
+
+def get_questions() -> tuple:
     """Get all quiz questions (without weights for client)."""
-    return [
-        {
-            "id": q["id"],
-            "question": q["question"],
-            "options": [
-                {"id": opt["id"], "text": opt["text"]}
-                for opt in q["options"]
-            ]
-        }
-        for q in QUIZ_QUESTIONS
-    ]
+    return _PUBLIC_QUESTIONS
 
 
 def get_question_by_id(question_id: str) -> dict | None:
     """Get a specific question by ID."""
-    for q in QUIZ_QUESTIONS:
-        if q["id"] == question_id:
-            return q
-    return None
+    return _QUESTIONS_BY_ID.get(question_id)
+
+
+def get_option_by_id(question_id: str, option_id: str) -> dict | None:
+    """Get a specific question option, or None if either ID is unknown."""
+    options = _OPTIONS_BY_QID.get(question_id)
+    return options.get(option_id) if options else None
@@ -1,8 +1,9 @@
 """Quiz scoring and user vector calculation."""
+import functools
 import numpy as np
 from typing import Optional
 
-from .questions import QUIZ_QUESTIONS, get_question_by_id
+from .questions import QUIZ_QUESTIONS
 
 
 FEATURE_KEYS = [
@@ -16,67 +17,106 @@ FEATURE_KEYS = [
 ]
 
 
+def _compile_option_matrices() -> tuple[dict, np.ndarray, np.ndarray]:
+    """Flatten the option weights into stacked matrices at import.
+
+    Every (question_id, option_id) pair maps to one row of a dense
+    (Q*O, 7) weight matrix plus a parallel mask matrix of which
+    features it actually sets, so scoring a whole answer set is one
+    gather and two column sums instead of a Python dict walk per
+    answer.
+    """
+    row_map = {}
+    rows = []
+    masks = []
+    for question in QUIZ_QUESTIONS:
+        for option in question["options"]:
+            weights = option.get("weights", {})
+            row_map[(question["id"], option["id"])] = len(rows)
+            rows.append([weights.get(key, 0.0) for key in FEATURE_KEYS])
+            masks.append([key in weights for key in FEATURE_KEYS])
+    # float64 so the averaged user vector round-trips as clean doubles
+    # (float32 would leak noise like 0.6000000238 into API responses
+    # and the persisted profile JSON); the matrices are tiny either way
+    weight_matrix = np.asarray(rows, dtype=np.float64)
+    mask_matrix = np.asarray(masks, dtype=np.float64)
+    return row_map, weight_matrix, mask_matrix
+
+
+_OPTION_ROWS, _WEIGHTS_MATRIX, _WEIGHTS_MASK = _compile_option_matrices()
+
+
 def calculate_user_vector(answers: list[dict]) -> dict[str, float]:
     """
     Calculate user feature vector from quiz answers.
 
+    Answer combinations come from a small discrete set, so results are
+    memoized on the sorted (question_id, option_id) tuple.
+
     Args:
         answers: List of {"question_id": str, "option_id": str}
 
     Returns:
         Dictionary mapping feature names to normalized values (0-1)
     """
-    # Accumulate weights for each feature
-    feature_totals: dict[str, list[float]] = {key: [] for key in FEATURE_KEYS}
-
-    for answer in answers:
-        question_id = answer.get("question_id")
-        option_id = answer.get("option_id")
-
-        question = get_question_by_id(question_id)
-        if not question:
-            continue
-
-        # Find the selected option
-        selected_option = None
-        for opt in question["options"]:
-            if opt["id"] == option_id:
-                selected_option = opt
-                break
-
-        if not selected_option:
-            continue
-
-        # Add weights from this answer
-        weights = selected_option.get("weights", {})
-        for feature, weight in weights.items():
-            if feature in feature_totals:
-                feature_totals[feature].append(weight)
-
-    # Calculate average for each feature
-    result = {}
-    for feature in FEATURE_KEYS:
-        values = feature_totals[feature]
-        if values:
-            result[feature] = sum(values) / len(values)
-        else:
-            # Default to middle value if no answers affected this feature
-            result[feature] = 0.5
-
-    return result
-
-
-def vector_to_array(vector: dict[str, float]) -> np.ndarray:
+    answer_items = tuple(sorted(
+        (a.get("question_id"), a.get("option_id")) for a in answers
+    ))
+    values = _calculate_user_vector_cached(answer_items)
+    return dict(zip(FEATURE_KEYS, values))
+
+
+@functools.lru_cache(maxsize=8192)
+def _calculate_user_vector_cached(
+    answer_items: tuple[tuple[str, str], ...]
+) -> tuple[float, ...]:
+    """Scoring kernel for calculate_user_vector, cached per answer set."""
+    indices = [
+        row for answer_key in answer_items
+        if (row := _OPTION_ROWS.get(answer_key)) is not None
+    ]
+    if not indices:
+        return (0.5,) * len(FEATURE_KEYS)
+
+    # One gather over the stacked weight/mask matrices covers every
+    # answer; features no answer touched default to the middle value
+    totals = _WEIGHTS_MATRIX[indices].sum(axis=0)
+    counts = _WEIGHTS_MASK[indices].sum(axis=0)
+    averages = np.where(counts > 0, totals / np.maximum(counts, 1), 0.5)
+    return tuple(averages.tolist())
+
+
+_FEATURE_INDEX = {key: i for i, key in enumerate(FEATURE_KEYS)}
+
+
+def vector_to_array(
+    vector: dict[str, float],
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     Convert feature vector dictionary to numpy array.
 
+    Writes through a prebuilt key->index map instead of building an
+    intermediate list; callers on a hot path can pass a reusable `out`
+    buffer of shape (7,) to skip the allocation too.
+
     Args:
         vector: Dictionary mapping feature names to values
+        out: Optional float32 buffer to fill and return
 
     Returns:
-        Numpy array with features in standard order
+        float32 array with features in standard order (0.5 defaults)
     """
-    return np.array([vector.get(key, 0.5) for key in FEATURE_KEYS])
+    if out is None:
+        out = np.full(len(FEATURE_KEYS), 0.5, dtype=np.float32)
+    else:
+        out.fill(0.5)
+
+    for key, value in vector.items():
+        i = _FEATURE_INDEX.get(key)
+        if i is not None:
+            out[i] = value
+    return out
 
 
 def array_to_vector(arr: np.ndarray) -> dict[str, float]:
@@ -96,27 +136,41 @@ def get_radar_chart_data(vector: dict[str, float]) -> list[dict]:
     """
     Format feature vector for radar chart display.
 
+    Memoized on the rounded vector values; treat the result as
+    read-only.
+
     Args:
         vector: Feature vector dictionary
 
     Returns:
         List of {feature, value, fullMark} dicts for radar chart
     """
-    display_names = {
-        "bpm_normalized": "Tempo",
-        "energy": "Energy",
-        "danceability": "Danceability",
-        "acousticness": "Acoustic",
-        "valence": "Positivity",
-        "instrumentalness": "Instrumental",
-        "loudness": "Loudness"
-    }
+    key = tuple(round(vector.get(k, 0.5), 3) for k in FEATURE_KEYS)
+    return _radar_chart_data_cached(key)
+
+
+_DISPLAY_NAMES = {
+    "bpm_normalized": "Tempo",
+    "energy": "Energy",
+    "danceability": "Danceability",
+    "acousticness": "Acoustic",
+    "valence": "Positivity",
+    "instrumentalness": "Instrumental",
+    "loudness": "Loudness"
+}
+
+
+@functools.lru_cache(maxsize=8192)
+def _radar_chart_data_cached(values: tuple[float, ...]) -> list[dict]:
+    """Radar chart formatting kernel, cached per rounded vector."""
+    # All 7 display values in one scaled round
+    scaled = np.round(np.asarray(values) * 100.0, 1).tolist()
 
     return [
         {
-            "feature": display_names.get(key, key),
-            "value": round(vector.get(key, 0.5) * 100, 1),
+            "feature": _DISPLAY_NAMES.get(key, key),
+            "value": value,
             "fullMark": 100
         }
-        for key in FEATURE_KEYS
+        for key, value in zip(FEATURE_KEYS, scaled)
     ]
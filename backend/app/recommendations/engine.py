@@ -1,4 +1,6 @@
 """Recommendation engine for matching users to songs."""
+import asyncio
+
 import numpy as np
 from typing import Optional
 
@@ -7,9 +9,95 @@ from ..db import (
     Cluster,
     get_all_clusters,
     get_songs_by_cluster,
-    get_cluster_by_id,
 )
 from ..quiz.scoring import FEATURE_KEYS, vector_to_array
+from ..clustering.cache import (
+    cluster_data_version,
+    get_centroid_snapshot,
+    set_centroid_snapshot,
+    get_cluster_matrix,
+    set_cluster_matrix,
+)
+
+
+def _centroid_matrix(centroids: list[dict]) -> tuple[np.ndarray, list[int]]:
+    """Stack centroid dicts into a (K, 7) float32 matrix plus cluster IDs."""
+    cluster_ids = [c.get("cluster_id", 0) for c in centroids]
+    matrix = np.array([
+        [c.get(key, 0.5) for key in FEATURE_KEYS]
+        for c in centroids
+    ], dtype=np.float32)
+    return matrix, cluster_ids
+
+
+def _cached_centroid_matrix(clusters: list[Cluster]) -> tuple[np.ndarray, list[int]]:
+    """Centroid matrix for the given clusters, reused across requests.
+
+    Centroids only change on re-clustering, so the stacked matrix is
+    cached behind the cluster version stamp and shared with the
+    visualization endpoint (FEATURE_KEYS matches the column order used
+    there).
+    """
+    snapshot = get_centroid_snapshot()
+    if snapshot is not None:
+        return snapshot
+
+    matrix = np.array([
+        [cluster.centroid.get(key, 0.5) for key in FEATURE_KEYS]
+        for cluster in clusters
+    ], dtype=np.float32)
+    cluster_ids = [cluster.id for cluster in clusters]
+    set_centroid_snapshot(matrix, cluster_ids)
+    return matrix, cluster_ids
+
+
+def _rank_clusters(
+    user_arr: np.ndarray,
+    matrix: np.ndarray,
+    cluster_ids: list[int],
+    n: int
+) -> list[tuple[int, float]]:
+    """The n nearest clusters as (cluster_id, distance), sorted.
+
+    One fused distance pass serves both the matched cluster (first
+    entry) and the adjacent list, instead of recomputing distances per
+    question. Squared distances drive the selection; sqrt runs only on
+    the n returned entries.
+    """
+    diffs = matrix - user_arr
+    sq_distances = np.einsum("ij,ij->i", diffs, diffs)
+
+    # Select the n nearest without a full sort, then order just them
+    n = min(n, len(cluster_ids))
+    nearest = np.argpartition(sq_distances, n - 1)[:n]
+    order = nearest[np.argsort(sq_distances[nearest])]
+    distances = np.sqrt(sq_distances[order])
+    return [
+        (cluster_ids[i], float(distance))
+        for i, distance in zip(order, distances)
+    ]
+
+
+def _nearest_from_matrix(
+    user_arr: np.ndarray,
+    matrix: np.ndarray,
+    cluster_ids: list[int]
+) -> tuple[int, float]:
+    """Nearest cluster id and distance from a prebuilt centroid matrix."""
+    return _rank_clusters(user_arr, matrix, cluster_ids, n=1)[0]
+
+
+def _adjacent_from_matrix(
+    user_arr: np.ndarray,
+    matrix: np.ndarray,
+    cluster_ids: list[int],
+    n: int
+) -> list[int]:
+    """n nearest cluster ids from a prebuilt centroid matrix."""
+    return [
+        cluster_id
+        for cluster_id, _ in _rank_clusters(user_arr, matrix, cluster_ids, n)
+    ]
 
 
 def find_nearest_cluster(
@@ -26,24 +114,12 @@ def find_nearest_cluster(
     Returns:
         Tuple of (cluster_id, distance)
     """
-    user_arr = vector_to_array(user_vector)
-
-    best_cluster_id = 0
-    best_distance = float('inf')
-
-    for centroid in centroids:
-        cluster_id = centroid.get("cluster_id", 0)
-        centroid_arr = np.array([
-            centroid.get(key, 0.5) for key in FEATURE_KEYS
-        ])
+    if not centroids:
+        return 0, float('inf')
 
-        distance = np.linalg.norm(user_arr - centroid_arr)
-
-        if distance < best_distance:
-            best_distance = distance
-            best_cluster_id = cluster_id
-
-    return best_cluster_id, float(best_distance)
+    user_arr = vector_to_array(user_vector)
+    matrix, cluster_ids = _centroid_matrix(centroids)
+    return _nearest_from_matrix(user_arr, matrix, cluster_ids)
 
 
 def get_adjacent_clusters(
@@ -62,20 +138,12 @@ def get_adjacent_clusters(
     Returns:
         List of cluster IDs sorted by distance
     """
-    user_arr = vector_to_array(user_vector)
-
-    distances = []
-    for centroid in centroids:
-        cluster_id = centroid.get("cluster_id", 0)
-        centroid_arr = np.array([
-            centroid.get(key, 0.5) for key in FEATURE_KEYS
-        ])
-        distance = np.linalg.norm(user_arr - centroid_arr)
-        distances.append((cluster_id, distance))
+    if not centroids:
+        return []
 
-    # Sort by distance and return top n cluster IDs
-    distances.sort(key=lambda x: x[1])
-    return [d[0] for d in distances[:n]]
+    user_arr = vector_to_array(user_vector)
+    matrix, cluster_ids = _centroid_matrix(centroids)
+    return _adjacent_from_matrix(user_arr, matrix, cluster_ids, n)
 
 
 def rank_songs_in_cluster(
@@ -94,37 +162,113 @@ def rank_songs_in_cluster(
     Returns:
         List of song dictionaries with similarity scores
     """
+    if not songs:
+        return []
+
     user_arr = vector_to_array(user_vector)
+    unit_matrix = _unit_feature_matrix(songs)
+    return _rank_by_unit_matrix(user_arr, songs, unit_matrix, limit)
+
+
+def _unit_feature_matrix(songs: list[Song]) -> np.ndarray:
+    """(N, 7) float32 song feature matrix with unit-normalized rows.
+
+    Rows with a zero norm stay zero, matching the old similarity = 0
+    behavior for all-zero feature vectors.
+    """
+    matrix = Song.feature_matrix(songs)
+    # Fused sum-of-squares sidesteps np.linalg.norm's dispatch overhead
+    # on these tiny 7-wide rows
+    norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))[:, np.newaxis]
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def _rank_by_unit_matrix(
+    user_arr: np.ndarray,
+    songs: list[Song],
+    unit_matrix: np.ndarray,
+    limit: int
+) -> list[dict]:
+    """Rank songs against a prebuilt unit feature matrix.
 
-    scored_songs = []
-    for song in songs:
-        song_arr = np.array([
-            song.bpm / 200.0,  # bpm_normalized
-            song.energy,
-            song.danceability,
-            song.acousticness,
-            song.valence,
-            song.instrumentalness,
-            song.loudness,
-        ])
-
-        # Calculate cosine similarity
-        dot_product = np.dot(user_arr, song_arr)
-        norm_product = np.linalg.norm(user_arr) * np.linalg.norm(song_arr)
-
-        if norm_product > 0:
-            similarity = dot_product / norm_product
-        else:
-            similarity = 0
-
-        scored_songs.append({
-            **song.to_dict(),
-            "similarity_score": round(float(similarity), 3)
-        })
-
-    # Sort by similarity (highest first) and limit
-    scored_songs.sort(key=lambda x: x["similarity_score"], reverse=True)
-    return scored_songs[:limit]
+    Takes the already-converted user array so one conversion and one
+    norm serve every scoring call in a request.
+    """
+    if not songs:
+        return []
+
+    # Plain dot product: cheaper than np.linalg.norm for a 7-vector
+    user_norm = float(np.sqrt(user_arr @ user_arr))
+
+    # Cosine similarity collapses to one matrix-vector product on the
+    # pre-normalized rows
+    if user_norm > 0:
+        similarities = unit_matrix @ (user_arr / user_norm)
+    else:
+        similarities = np.zeros(len(songs), dtype=np.float32)
+
+    # Select the top rows without sorting the whole cluster, then
+    # order just the selected slice (highest first)
+    limit = min(limit, len(songs))
+    top = np.argpartition(-similarities, limit - 1)[:limit]
+    top = top[np.argsort(-similarities[top], kind="stable")]
+
+    # Round the selected scores in one vectorized pass; tolist() hands
+    # back native floats so no per-song float()/round() calls remain
+    scores = np.round(similarities[top], 3).tolist()
+
+    # Extend the dicts in place rather than rebuilding them with a merge
+    ranked = []
+    for i, score in zip(top, scores):
+        scored = songs[i].to_dict()
+        scored["similarity_score"] = score
+        ranked.append(scored)
+    return ranked
+
+
+# Cluster-match results keyed by the exact user vector bytes; quiz
+# answers come from a small discrete set, so repeat vectors are common.
+# Entries are stamped with the cluster version like the centroid cache.
+_MATCH_CACHE: dict = {}
+_MATCH_CACHE_MAX = 4096
+
+
+def _ranked_clusters_cached(
+    user_arr: np.ndarray,
+    matrix: np.ndarray,
+    cluster_ids: list[int],
+    n: int
+) -> list[tuple[int, float]]:
+    """_rank_clusters memoized per user vector and cluster version."""
+    version = cluster_data_version()
+    key = (user_arr.tobytes(), n)
+    entry = _MATCH_CACHE.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    ranked = _rank_clusters(user_arr, matrix, cluster_ids, n)
+    if len(_MATCH_CACHE) >= _MATCH_CACHE_MAX:
+        _MATCH_CACHE.clear()
+    _MATCH_CACHE[key] = (version, ranked)
+    return ranked
+
+
+def _rank_songs_cached(
+    user_arr: np.ndarray,
+    cluster_id: int,
+    songs: list[Song],
+    limit: int
+) -> list[dict]:
+    """rank_songs_in_cluster with the unit matrix cached per cluster.
+
+    The matrix is stamped with the song version, so any song write
+    rebuilds it on the next request.
+    """
+    unit_matrix = get_cluster_matrix(cluster_id)
+    if unit_matrix is None or unit_matrix.shape[0] != len(songs):
+        unit_matrix = _unit_feature_matrix(songs)
+        set_cluster_matrix(cluster_id, unit_matrix)
+    return _rank_by_unit_matrix(user_arr, songs, unit_matrix, limit)
 
 
 async def get_recommendations(
@@ -151,41 +295,49 @@ async def get_recommendations(
             "adjacent_clusters": []
         }
 
-    # Build centroids list
-    centroids = []
-    for cluster in clusters:
-        centroid = cluster.centroid
-        centroid["cluster_id"] = cluster.id
-        centroids.append(centroid)
+    # Centroid matrix is cached behind the cluster version stamp
+    matrix, cluster_ids = _cached_centroid_matrix(clusters)
+    # Converted once; shared by cluster matching and song ranking
+    user_arr = vector_to_array(user_vector)
+
+    # One distance pass covers the matched cluster and the adjacents
+    ranked_clusters = _ranked_clusters_cached(user_arr, matrix, cluster_ids, n=3)
+    matched_cluster_id, distance = ranked_clusters[0]
 
-    # Find nearest cluster
-    matched_cluster_id, distance = find_nearest_cluster(user_vector, centroids)
+    # The entries after the match are its nearest neighbours
+    adjacent_ids = [
+        cid for cid, _ in ranked_clusters[1:]
+        if cid != matched_cluster_id
+    ][:2]
 
-    # Get matched cluster details
-    matched_cluster = await get_cluster_by_id(matched_cluster_id)
+    # Cluster rows were already fetched by get_all_clusters; only the
+    # song fetches remain, and they are independent, so overlap them
+    clusters_by_id = {cluster.id: cluster for cluster in clusters}
+    matched_cluster = clusters_by_id.get(matched_cluster_id)
 
-    # Get songs from matched cluster
-    songs = await get_songs_by_cluster(matched_cluster_id)
-    ranked_songs = rank_songs_in_cluster(user_vector, songs, limit)
+    results = await asyncio.gather(
+        get_songs_by_cluster(matched_cluster_id),
+        *(
+            get_songs_by_cluster(cluster_id, limit=3)
+            for cluster_id in adjacent_ids
+        ),
+    )
 
-    # Get adjacent clusters
-    adjacent_ids = get_adjacent_clusters(user_vector, centroids, n=3)
-    # Remove matched cluster from adjacent list if present
-    adjacent_ids = [cid for cid in adjacent_ids if cid != matched_cluster_id][:2]
+    songs = results[0]
+    ranked_songs = _rank_songs_cached(user_arr, matched_cluster_id, songs, limit)
 
     adjacent_clusters = []
-    for cluster_id in adjacent_ids:
-        cluster = await get_cluster_by_id(cluster_id)
+    for cluster_id, sample_songs in zip(adjacent_ids, results[1:]):
+        cluster = clusters_by_id.get(cluster_id)
         if cluster:
-            # Get sample songs for preview
-            sample_songs = await get_songs_by_cluster(cluster_id, limit=3)
             adjacent_clusters.append({
                 **cluster.to_dict(),
                 "sample_songs": [s.to_dict() for s in sample_songs]
             })
 
-    # Get sample songs for matched cluster
-    matched_sample = await get_songs_by_cluster(matched_cluster_id, limit=5)
+    # Matched-cluster samples are the head of the full fetch, which is
+    # ordered the same way as the limited query
+    matched_sample = songs[:5]
 
     matched_cluster_data = matched_cluster.to_dict() if matched_cluster else {}
     matched_cluster_data["distance"] = round(distance, 3)
@@ -214,10 +366,14 @@ async def get_cluster_recommendations(
     Returns:
         List of song dictionaries
     """
-    songs = await get_songs_by_cluster(cluster_id)
-
     if user_vector:
-        return rank_songs_in_cluster(user_vector, songs, limit)
-
-    # Without user vector, return songs sorted by title
-    return [song.to_dict() for song in songs[:limit]]
+        # Ranking needs the whole cluster; to_dict() still only runs on
+        # the final top-limit rows
+        songs = await get_songs_by_cluster(cluster_id)
+        user_arr = vector_to_array(user_vector)
+        return _rank_songs_cached(user_arr, cluster_id, songs, limit)
+
+    # Without a user vector the DB ordering is final, so let the query
+    # stop at limit instead of fetching and slicing the whole cluster
+    songs = await get_songs_by_cluster(cluster_id, limit=limit)
+    return [song.to_dict() for song in songs]
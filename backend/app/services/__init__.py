@@ -1,8 +1,20 @@
 """Services module."""
-from .spotify import SpotifyService, get_spotify_service, reset_spotify_service
+from .spotify import (
+    SpotifyService,
+    get_spotify_service,
+    reset_spotify_service,
+    close_spotify_service,
+)
+from .ttl_cache import TTLCache
+from .feature_loader import FeatureLoader, get_feature_loader, reset_feature_loader
 
 __all__ = [
     "SpotifyService",
     "get_spotify_service",
     "reset_spotify_service",
+    "close_spotify_service",
+    "TTLCache",
+    "FeatureLoader",
+    "get_feature_loader",
+    "reset_feature_loader",
 ]
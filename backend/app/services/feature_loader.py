@@ -0,0 +1,113 @@
+"""Batched loader for Spotify audio features."""
+import asyncio
+from typing import Optional
+
+from .spotify import SpotifyService, get_spotify_service
+
+
+# Spotify's /audio-features endpoint accepts up to 100 ids per call
+MAX_BATCH_SIZE = 100
+
+# How long to wait for more ids before flushing a partial batch
+BATCH_WINDOW_SECONDS = 0.01
+
+
+class FeatureLoader:
+    """Coalesces concurrent single-track feature lookups into batch calls.
+
+    Requests arriving within the batch window share one call to
+    get_audio_features_batch, turning N concurrent HTTP round-trips
+    into ceil(N/100).
+    """
+
+    def __init__(
+        self,
+        spotify: SpotifyService,
+        batch_window: float = BATCH_WINDOW_SECONDS,
+        max_batch_size: int = MAX_BATCH_SIZE
+    ):
+        self._spotify = spotify
+        self._batch_window = batch_window
+        self._max_batch_size = max_batch_size
+        self._pending: dict[str, asyncio.Future] = {}
+        self._window_task: Optional[asyncio.Task] = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def load(self, track_id: str) -> Optional[dict]:
+        """
+        Get audio features for a track, batching with concurrent callers.
+
+        Args:
+            track_id: Spotify track ID
+
+        Returns:
+            Audio features dictionary or None if not found
+        """
+        future = self._pending.get(track_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[track_id] = future
+
+            if len(self._pending) >= self._max_batch_size:
+                self._schedule_flush()
+            elif self._window_task is None:
+                self._window_task = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self):
+        """Wait out the batch window, then flush whatever accumulated."""
+        await asyncio.sleep(self._batch_window)
+        self._window_task = None
+        await self._flush()
+
+    def _schedule_flush(self):
+        """Flush immediately (batch is full) without waiting for the window."""
+        if self._window_task is not None:
+            self._window_task.cancel()
+            self._window_task = None
+
+        task = asyncio.create_task(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self):
+        """Issue one batch call and resolve all pending futures."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        track_ids = list(pending)
+        try:
+            # spotipy is synchronous; run off the event loop
+            features_list = await asyncio.to_thread(
+                self._spotify.get_audio_features_batch, track_ids
+            )
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        features_by_id = {f.get("spotify_id"): f for f in features_list}
+        for track_id, future in pending.items():
+            if not future.done():
+                future.set_result(features_by_id.get(track_id))
+
+
+# Singleton instance
+_feature_loader: Optional[FeatureLoader] = None
+
+
+def get_feature_loader() -> FeatureLoader:
+    """Get or create the feature loader singleton."""
+    global _feature_loader
+    if _feature_loader is None:
+        _feature_loader = FeatureLoader(get_spotify_service())
+    return _feature_loader
+
+
+def reset_feature_loader():
+    """Reset the feature loader (useful for testing)."""
+    global _feature_loader
+    _feature_loader = None
@@ -1,9 +1,58 @@
 """Spotify API service for Music Match."""
 import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from functools import lru_cache
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+import functools
+
+from .ttl_cache import TTLCache
+
+# spotipy (plus requests/urllib3 underneath) is imported lazily in
+# SpotifyService.__init__ so workers that never touch Spotify don't pay
+# its import cost at startup; the module global is set on first init
+# and the API methods only run on a constructed instance.
+spotipy = None
+
+
+# Track metadata and audio features are immutable per track ID, so a
+# long TTL turns repeat lookups into dict hits with no HTTP round-trip
+_track_cache = TTLCache(maxsize=16384, ttl=86400.0)
+_features_cache = TTLCache(maxsize=16384, ttl=86400.0)
+
+# Rate-limit retry policy: honor Retry-After on 429 up to this many
+# attempts, never sleeping longer than the cap per attempt
+_MAX_RETRIES = 3
+_MAX_RETRY_WAIT = 30.0
+
+# Client-side sliding-window limiter, sized just under Spotify's soft
+# limit so bursts queue locally instead of turning into 429 round-trips
+_WINDOW_SECONDS = 30.0
+_WINDOW_LIMIT = 170
+
+# Refresh the access token this many seconds before it expires, off the
+# request path, so no caller pays the refresh round-trip inline
+_TOKEN_REFRESH_MARGIN = 60.0
+
+# Audio-features output schema as (key, default) pairs; interned once
+# at import instead of re-spelled as a 14-entry dict literal on every
+# formatted response
+_AF_FIELDS = (
+    ("danceability", 0),
+    ("energy", 0),
+    ("key", 0),
+    ("loudness", 0),
+    ("mode", 0),  # 0 = minor, 1 = major
+    ("speechiness", 0),
+    ("acousticness", 0),
+    ("instrumentalness", 0),
+    ("liveness", 0),
+    ("valence", 0),
+    ("tempo", 0),
+    ("duration_ms", 0),
+    ("time_signature", 4),
+)
 
 
 class SpotifyService:
@@ -11,6 +60,11 @@ class SpotifyService:
 
     def __init__(self):
         """Initialize Spotify client with client credentials flow."""
+        global spotipy
+        import requests
+        import spotipy
+        from spotipy.oauth2 import SpotifyClientCredentials
+
         client_id = os.getenv("SPOTIFY_CLIENT_ID")
         client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
 
@@ -23,7 +77,134 @@ class SpotifyService:
             client_id=client_id,
             client_secret=client_secret
         )
-        self._client = spotipy.Spotify(auth_manager=auth_manager)
+        self._auth_manager = auth_manager
+
+        # One pooled keep-alive session shared by every API call; the
+        # routes fan calls out via asyncio.to_thread, so size the
+        # adapter pool to match that concurrency instead of paying a
+        # TLS handshake whenever the default pool overflows
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self._session = session
+
+        self._client = spotipy.Spotify(
+            auth_manager=auth_manager,
+            requests_session=session,
+            requests_timeout=30
+        )
+
+        # Shared backoff deadline: once one call sees a 429, calls on
+        # other threads wait it out instead of piling onto the limit
+        self._backoff_lock = threading.Lock()
+        self._next_allowed_at = 0.0
+
+        # Timestamps of requests admitted in the last window
+        self._request_times: deque = deque()
+
+        # Guards the single in-flight background token refresh
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    def _maybe_refresh_token(self):
+        """Start a background token refresh if expiry is near.
+
+        spotipy refreshes lazily, which makes one unlucky request eat a
+        full auth round-trip. Checking after each successful call and
+        refreshing on a daemon thread hides that latency; at most one
+        refresh runs at a time.
+        """
+        token_info = getattr(self._auth_manager, "token_info", None)
+        if not token_info:
+            return
+        expires_at = token_info.get("expires_at")
+        if not expires_at or expires_at - time.time() > _TOKEN_REFRESH_MARGIN:
+            return
+
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_token, daemon=True).start()
+
+    def _refresh_token(self):
+        try:
+            # check_cache=False forces a fresh token from the auth server
+            self._auth_manager.get_access_token(check_cache=False)
+        except Exception:
+            # Next request falls back to spotipy's inline refresh
+            pass
+        finally:
+            with self._refresh_lock:
+                self._refreshing = False
+
+    def _admit(self):
+        """Block until the sliding request window has room.
+
+        Purges timestamps older than the window, then either records
+        this request or sleeps until the oldest one ages out. Keeps
+        burst traffic under Spotify's soft limit so it queues here for
+        milliseconds instead of bouncing off a 429.
+        """
+        while True:
+            with self._backoff_lock:
+                now = time.monotonic()
+                cutoff = now - _WINDOW_SECONDS
+                while self._request_times and self._request_times[0] <= cutoff:
+                    self._request_times.popleft()
+
+                if len(self._request_times) < _WINDOW_LIMIT:
+                    self._request_times.append(now)
+                    return
+                wait = self._request_times[0] + _WINDOW_SECONDS - now
+            time.sleep(wait)
+
+    def _call(self, fn, *args, **kwargs):
+        """Invoke a client method with centralized rate-limit handling.
+
+        On HTTP 429 the Retry-After header decides the backoff (capped),
+        the shared deadline is advanced so concurrent calls pre-emptively
+        wait, and the call is retried. Other errors propagate to the
+        per-method handlers unchanged. Runs on worker threads, so the
+        sleeps here never block the event loop.
+        """
+        for attempt in range(_MAX_RETRIES + 1):
+            with self._backoff_lock:
+                wait = self._next_allowed_at - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, _MAX_RETRY_WAIT))
+
+            self._admit()
+
+            try:
+                result = fn(*args, **kwargs)
+                self._maybe_refresh_token()
+                return result
+            except spotipy.exceptions.SpotifyException as e:
+                if e.http_status != 429 or attempt == _MAX_RETRIES:
+                    raise
+
+                headers = getattr(e, "headers", None) or {}
+                try:
+                    retry_after = float(headers.get("Retry-After", 1))
+                except (TypeError, ValueError):
+                    retry_after = 1.0
+                delay = min(max(retry_after, 1.0), _MAX_RETRY_WAIT)
+
+                with self._backoff_lock:
+                    self._next_allowed_at = max(
+                        self._next_allowed_at,
+                        time.monotonic() + delay
+                    )
+                time.sleep(delay)
+
+    def close(self):
+        """Release the pooled HTTP session."""
+        self._session.close()
 
     def search_tracks(
         self,
@@ -42,7 +223,8 @@ class SpotifyService:
         Returns:
             List of track dictionaries with relevant info
         """
-        results = self._client.search(
+        results = self._call(
+            self._client.search,
             q=query,
             type="track",
             limit=min(limit, 50),
@@ -65,18 +247,36 @@ class SpotifyService:
         Returns:
             Track dictionary or None if not found
         """
+        cached = _track_cache.get(track_id)
+        if cached is not None:
+            return cached
+
         try:
-            track = self._client.track(track_id)
-            return self._format_track(track)
+            track = self._call(self._client.track, track_id)
         except spotipy.exceptions.SpotifyException:
             return None
 
+        formatted = self._format_track(track)
+        _track_cache.set(track_id, formatted)
+        return formatted
+
+    def _fetch_tracks_chunk(self, chunk: list[str]) -> list:
+        """Fetch one ≤50-ID tracks batch, [] on API error."""
+        try:
+            results = self._call(self._client.tracks, chunk)
+        except spotipy.exceptions.SpotifyException:
+            return []
+        return results.get("tracks", []) if results else []
+
     def get_tracks(self, track_ids: list[str]) -> list[dict]:
         """
         Get multiple tracks by Spotify IDs.
 
+        Inputs larger than Spotify's 50-ID request cap are split into
+        chunks fetched in parallel rather than truncated.
+
         Args:
-            track_ids: List of Spotify track IDs (max 50)
+            track_ids: List of Spotify track IDs
 
         Returns:
             List of track dictionaries
@@ -84,18 +284,36 @@ class SpotifyService:
         if not track_ids:
             return []
 
-        # Spotify API allows max 50 tracks per request
-        track_ids = track_ids[:50]
-
-        try:
-            results = self._client.tracks(track_ids)
-            return [
-                self._format_track(track)
-                for track in results.get("tracks", [])
-                if track is not None
-            ]
-        except spotipy.exceptions.SpotifyException:
-            return []
+        # Serve what we can from cache; only the misses go to Spotify
+        found = {}
+        misses = []
+        for track_id in track_ids:
+            cached = _track_cache.get(track_id)
+            if cached is not None:
+                found[track_id] = cached
+            elif track_id not in misses:
+                misses.append(track_id)
+
+        # Spotify allows max 50 tracks per request; overlap the chunk
+        # requests on a small thread pool (the rate limiter still
+        # gates each one)
+        chunks = [misses[i:i + 50] for i in range(0, len(misses), 50)]
+        if len(chunks) == 1:
+            batches = [self._fetch_tracks_chunk(chunks[0])]
+        elif chunks:
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                batches = list(pool.map(self._fetch_tracks_chunk, chunks))
+        else:
+            batches = []
+
+        for tracks in batches:
+            for track in tracks:
+                if track is not None:
+                    formatted = self._format_track(track)
+                    _track_cache.set(formatted["spotify_id"], formatted)
+                    found[formatted["spotify_id"]] = formatted
+
+        return [found[tid] for tid in track_ids if tid in found]
 
     def get_audio_features(self, track_id: str) -> Optional[dict]:
         """
@@ -107,20 +325,37 @@ class SpotifyService:
         Returns:
             Audio features dictionary or None if not found
         """
+        cached = _features_cache.get(track_id)
+        if cached is not None:
+            return cached
+
         try:
-            features = self._client.audio_features([track_id])
-            if features and features[0]:
-                return self._format_audio_features(features[0])
-            return None
+            features = self._call(self._client.audio_features, [track_id])
         except spotipy.exceptions.SpotifyException:
             return None
 
+        if features and features[0]:
+            formatted = self._format_audio_features(features[0])
+            _features_cache.set(track_id, formatted)
+            return formatted
+        return None
+
+    def _fetch_features_chunk(self, chunk: list[str]) -> list:
+        """Fetch one ≤100-ID audio-features batch, [] on API error."""
+        try:
+            return self._call(self._client.audio_features, chunk) or []
+        except spotipy.exceptions.SpotifyException:
+            return []
+
     def get_audio_features_batch(self, track_ids: list[str]) -> list[dict]:
         """
         Get audio features for multiple tracks.
 
+        Inputs larger than Spotify's 100-ID request cap are split into
+        chunks fetched in parallel rather than truncated.
+
         Args:
-            track_ids: List of Spotify track IDs (max 100)
+            track_ids: List of Spotify track IDs
 
         Returns:
             List of audio features dictionaries
@@ -128,18 +363,36 @@ class SpotifyService:
         if not track_ids:
             return []
 
-        # Spotify API allows max 100 tracks per request
-        track_ids = track_ids[:100]
-
-        try:
-            features_list = self._client.audio_features(track_ids)
-            return [
-                self._format_audio_features(features)
-                for features in features_list
-                if features is not None
-            ]
-        except spotipy.exceptions.SpotifyException:
-            return []
+        # Serve what we can from cache; only the misses go to Spotify
+        found = {}
+        misses = []
+        for track_id in track_ids:
+            cached = _features_cache.get(track_id)
+            if cached is not None:
+                found[track_id] = cached
+            elif track_id not in misses:
+                misses.append(track_id)
+
+        # Spotify allows max 100 tracks per request; overlap the chunk
+        # requests on a small thread pool (the rate limiter still
+        # gates each one)
+        chunks = [misses[i:i + 100] for i in range(0, len(misses), 100)]
+        if len(chunks) == 1:
+            batches = [self._fetch_features_chunk(chunks[0])]
+        elif chunks:
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                batches = list(pool.map(self._fetch_features_chunk, chunks))
+        else:
+            batches = []
+
+        for features_list in batches:
+            for features in features_list:
+                if features is not None:
+                    formatted = self._format_audio_features(features)
+                    _features_cache.set(formatted["spotify_id"], formatted)
+                    found[formatted["spotify_id"]] = formatted
+
+        return [found[tid] for tid in track_ids if tid in found]
 
     def get_recommendations(
         self,
@@ -172,7 +425,8 @@ class SpotifyService:
             seed_genres = None
 
         try:
-            results = self._client.recommendations(
+            results = self._call(
+                self._client.recommendations,
                 seed_tracks=seed_tracks[:5] if seed_tracks else None,
                 seed_artists=seed_artists[:5] if seed_artists else None,
                 seed_genres=seed_genres[:5] if seed_genres else None,
@@ -188,6 +442,53 @@ class SpotifyService:
         except spotipy.exceptions.SpotifyException:
             return []
 
+    def get_recommendations_batch(
+        self,
+        seed_groups: list[list[str]],
+        limit: int = 20,
+        **target_features
+    ) -> list[dict]:
+        """
+        Get recommendations for several seed-track groups at once.
+
+        Spotify caps one recommendations call at 5 seeds; callers with
+        more favorites than that can pass groups and get the calls
+        overlapped on a small thread pool (each still gated by the rate
+        limiter) instead of issuing them serially.
+
+        Args:
+            seed_groups: Lists of track IDs, each capped at 5 seeds
+            limit: Number of recommendations per group
+            **target_features: Target audio feature values
+
+        Returns:
+            Merged track dictionaries, de-duplicated by spotify_id,
+            in group order
+        """
+        groups = [group[:5] for group in seed_groups if group]
+        if not groups:
+            return []
+
+        def _fetch(group: list[str]) -> list[dict]:
+            return self.get_recommendations(group, limit=limit, **target_features)
+
+        if len(groups) == 1:
+            batches = [_fetch(groups[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                batches = list(pool.map(_fetch, groups))
+
+        seen = set()
+        merged = []
+        for tracks in batches:
+            for track in tracks:
+                spotify_id = track.get("spotify_id")
+                if spotify_id in seen:
+                    continue
+                seen.add(spotify_id)
+                merged.append(track)
+        return merged
+
     def get_track_with_features(self, track_id: str) -> Optional[dict]:
         """
         Get track info with audio features combined.
@@ -221,7 +522,7 @@ class SpotifyService:
         return {
             "spotify_id": track.get("id"),
             "title": track.get("name", ""),
-            "artist": ", ".join(a.get("name", "") for a in artists),
+            "artist": ", ".join([a.get("name", "") for a in artists]),
             "artist_ids": [a.get("id") for a in artists],
             "album": album.get("name", ""),
             "album_id": album.get("id"),
@@ -236,37 +537,30 @@ class SpotifyService:
 
     def _format_audio_features(self, features: dict) -> dict:
         """Format raw Spotify audio features into our schema."""
-        return {
-            "spotify_id": features.get("id"),
-            "danceability": features.get("danceability", 0),
-            "energy": features.get("energy", 0),
-            "key": features.get("key", 0),
-            "loudness": features.get("loudness", 0),
-            "mode": features.get("mode", 0),  # 0 = minor, 1 = major
-            "speechiness": features.get("speechiness", 0),
-            "acousticness": features.get("acousticness", 0),
-            "instrumentalness": features.get("instrumentalness", 0),
-            "liveness": features.get("liveness", 0),
-            "valence": features.get("valence", 0),
-            "tempo": features.get("tempo", 0),
-            "duration_ms": features.get("duration_ms", 0),
-            "time_signature": features.get("time_signature", 4),
-        }
-
-
-# Singleton instance
-_spotify_service: Optional[SpotifyService] = None
+        get = features.get
+        formatted = {"spotify_id": get("id")}
+        for key, default in _AF_FIELDS:
+            formatted[key] = get(key, default)
+        return formatted
 
 
+@functools.cache
 def get_spotify_service() -> SpotifyService:
     """Get or create the Spotify service singleton."""
-    global _spotify_service
-    if _spotify_service is None:
-        _spotify_service = SpotifyService()
-    return _spotify_service
+    return SpotifyService()
 
 
 def reset_spotify_service():
     """Reset the Spotify service (useful for testing)."""
-    global _spotify_service
-    _spotify_service = None
+    get_spotify_service.cache_clear()
+
+
+def close_spotify_service():
+    """Close the singleton's HTTP session and drop the instance.
+
+    Called from the app's lifespan shutdown; a no-op if the service
+    was never created.
+    """
+    if get_spotify_service.cache_info().currsize:
+        get_spotify_service().close()
+    get_spotify_service.cache_clear()
@@ -0,0 +1,61 @@
+"""In-process TTL cache for hot Spotify API responses."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """LRU cache whose entries expire after a fixed time-to-live.
+
+    Keeps network-bound lookups (Spotify search, recommendations) from
+    repeating for popular queries. Single-process but thread-safe: the
+    caches are hit from asyncio.to_thread and executor workers, so every
+    operation holds a lock around the OrderedDict. Entries are evicted
+    lazily on access and by LRU order when the cache is full.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 900.0):
+        """
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+            ttl: Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting least-recently-used entries if full."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -8,12 +8,17 @@ from pathlib import Path
 
 def init_db_command(args):
     """Initialize the database."""
-    from app.db import init_db
+    from app.db import init_db, close_db
 
     async def run():
-        print("Initializing database...")
-        await init_db()
-        print("Database initialized successfully!")
+        try:
+            print("Initializing database...")
+            await init_db()
+            print("Database initialized successfully!")
+        finally:
+            # The shared aiosqlite connection owns a non-daemon worker
+            # thread; close it so the process can exit
+            await close_db()
 
     asyncio.run(run())
 
@@ -21,125 +26,117 @@ def init_db_command(args):
 def extract_command(args):
     """Extract features from audio files."""
     from app.feature_extraction import batch_extract_features
+    from app.db import close_db
 
     async def run():
-        audio_dir = Path(args.audio_dir)
-        if not audio_dir.exists():
-            print(f"Error: Directory not found: {audio_dir}")
-            sys.exit(1)
-
-        print(f"Extracting features from: {audio_dir}")
-        await batch_extract_features(audio_dir)
-        print("Feature extraction complete!")
+        try:
+            audio_dir = Path(args.audio_dir)
+            if not audio_dir.exists():
+                print(f"Error: Directory not found: {audio_dir}")
+                sys.exit(1)
+
+            print(f"Extracting features from: {audio_dir}")
+            await batch_extract_features(audio_dir)
+            print("Feature extraction complete!")
+        finally:
+            await close_db()
 
     asyncio.run(run())
 
 
 def cluster_command(args):
     """Run clustering on songs in database."""
-    from app.db import init_db, get_all_songs, save_cluster, clear_clusters, update_song_cluster, get_cluster_by_id
-    from app.clustering import train_clusters, get_cluster_centroids, generate_cluster_description, find_optimal_k
-    import pandas as pd
+    from app.db import Song, init_db, close_db, get_all_songs, save_cluster, clear_clusters, bulk_update_song_cluster, update_cluster_counts
+    from app.clustering import train_clusters, get_cluster_centroids, generate_cluster_description, find_optimal_k, save_models
     import json
 
     async def run():
-        await init_db()
-
-        songs = await get_all_songs()
-        if not songs:
-            print("No songs in database. Run feature extraction first.")
-            sys.exit(1)
-
-        print(f"Found {len(songs)} songs")
-
-        # Build features DataFrame
-        features_data = []
-        for song in songs:
-            features_data.append({
-                "id": song.id,
-                "bpm_normalized": song.bpm / 200.0,
-                "energy": song.energy,
-                "danceability": song.danceability,
-                "acousticness": song.acousticness,
-                "valence": song.valence,
-                "instrumentalness": song.instrumentalness,
-                "loudness": song.loudness,
-            })
-
-        df = pd.DataFrame(features_data)
-
-        n_clusters = args.n_clusters
-        if args.auto:
-            print("Finding optimal number of clusters...")
-            n_clusters = find_optimal_k(df)
-            print(f"Optimal k: {n_clusters}")
-
-        print(f"Training {n_clusters} clusters...")
-
-        # Clear existing clusters
-        await clear_clusters()
-
-        # Train model
-        model, silhouette = train_clusters(df, n_clusters)
-        print(f"Silhouette score: {silhouette:.3f}")
-
-        # Save clusters
-        centroids = get_cluster_centroids(model)
-        cluster_id_map = {}
-
-        for centroid in centroids:
-            cluster_idx = centroid.pop("cluster_id")
-            description = generate_cluster_description(centroid)
-
-            from app.db import Cluster
-            cluster = Cluster(
-                centroid_json=json.dumps(centroid),
-                description=description,
-                song_count=0
-            )
-
-            db_cluster_id = await save_cluster(cluster)
-            cluster_id_map[cluster_idx] = db_cluster_id
-            print(f"  Cluster {db_cluster_id}: {description}")
-
-        # Assign songs
-        labels = model.labels_
-        cluster_counts = {}
-
-        for i, song in enumerate(songs):
-            cluster_idx = labels[i]
-            db_cluster_id = cluster_id_map[cluster_idx]
-            await update_song_cluster(song.id, db_cluster_id)
-            cluster_counts[db_cluster_id] = cluster_counts.get(db_cluster_id, 0) + 1
-
-        # Update counts
-        for db_cluster_id, count in cluster_counts.items():
-            existing = await get_cluster_by_id(db_cluster_id)
-            if existing:
-                existing.song_count = count
-                await save_cluster(existing)
-
-        print("\nClustering complete!")
+        try:
+            await init_db()
+
+            songs = await get_all_songs()
+            if not songs:
+                print("No songs in database. Run feature extraction first.")
+                sys.exit(1)
+
+            print(f"Found {len(songs)} songs")
+
+            # One contiguous float32 matrix, no per-song dicts or DataFrame
+            X = Song.feature_matrix(songs)
+
+            n_clusters = args.n_clusters
+            if args.auto:
+                print("Finding optimal number of clusters...")
+                n_clusters = find_optimal_k(X)
+                print(f"Optimal k: {n_clusters}")
+
+            print(f"Training {n_clusters} clusters...")
+
+            # Clear existing clusters
+            await clear_clusters()
+
+            # Train model
+            model, silhouette = train_clusters(X, n_clusters)
+            print(f"Silhouette score: {silhouette:.3f}")
+
+            # Persist so API workers can load instead of refitting
+            save_models(model)
+
+            # Save clusters
+            centroids = get_cluster_centroids(model)
+            cluster_id_map = {}
+
+            for centroid in centroids:
+                cluster_idx = centroid.pop("cluster_id")
+                description = generate_cluster_description(centroid)
+
+                from app.db import Cluster
+                cluster = Cluster(
+                    centroid_json=json.dumps(centroid),
+                    description=description,
+                    song_count=0
+                )
+
+                db_cluster_id = await save_cluster(cluster)
+                cluster_id_map[cluster_idx] = db_cluster_id
+                print(f"  Cluster {db_cluster_id}: {description}")
+
+            # Assign songs in one executemany transaction
+            labels = model.labels_
+            await bulk_update_song_cluster([
+                (song.id, cluster_id_map[labels[i]])
+                for i, song in enumerate(songs)
+            ])
+
+            # One correlated UPDATE recomputes every cluster's song count
+            await update_cluster_counts()
+
+            print("\nClustering complete!")
+        finally:
+            await close_db()
 
     asyncio.run(run())
 
 
 def seed_command(args):
     """Seed database with sample data."""
-    import subprocess
-    script_path = Path(__file__).parent / "scripts" / "seed_sample_data.py"
+    # Run the seeder in-process: no interpreter startup or re-imports,
+    # and it shares this process's DB connection and caches
+    from scripts.seed_sample_data import main_programmatic
 
-    cmd = [sys.executable, str(script_path)]
-    if args.songs:
-        cmd.extend(["--songs", str(args.songs)])
-    if args.clusters:
-        cmd.extend(["--clusters", str(args.clusters)])
-
-    subprocess.run(cmd)
+    asyncio.run(main_programmatic(n_songs=args.songs, n_clusters=args.clusters))
 
 
 def main():
     """Main CLI entry point."""
+    # Use the libuv event loop when available; the extract, cluster,
+    # and seed commands are I/O-heavy enough to benefit
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     parser = argparse.ArgumentParser(
         description="Music Match CLI",
         prog="python -m cli"
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 """Seed database with synthetic sample data for development."""
 import asyncio
-import random
 import json
 import sys
 from pathlib import Path
@@ -11,21 +10,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.db import (
     init_db,
+    close_db,
     Song,
     Cluster,
-    save_song_features,
+    save_songs_bulk,
     save_cluster,
     clear_clusters,
-    update_song_cluster,
+    update_cluster_counts,
+    bulk_update_song_cluster,
     get_all_songs,
 )
 from app.clustering import (
     train_clusters,
     get_cluster_centroids,
     generate_cluster_description,
-    FEATURE_COLUMNS,
 )
-import pandas as pd
 import numpy as np
 
 
@@ -55,95 +54,129 @@ TITLE_SINGLE = [
 ]
 
 
+# Object arrays let one rng.choice draw a whole column of names
+ARTISTS_ARR = np.array(ARTISTS, dtype=object)
+TITLE_SINGLE_ARR = np.array(TITLE_SINGLE, dtype=object)
+TITLE_PARTS_ARRS = [np.array(part, dtype=object) for part in TITLE_PARTS]
+
+
+def generate_song_titles_batch(n_songs: int) -> list[str]:
+    """Generate n_songs random song titles in a few vectorized draws.
+
+    All randomness comes from five rng calls regardless of n_songs;
+    only the final string assembly runs per title.
+    """
+    rng = np.random.default_rng()
+
+    singles = rng.choice(TITLE_SINGLE_ARR, size=n_songs).tolist()
+    first, second, third = (
+        rng.choice(arr, size=n_songs).tolist() for arr in TITLE_PARTS_ARRS
+    )
+    use_single = (rng.random(n_songs) < 0.4).tolist()
+
+    return [
+        single if flag else f"{a} {b} {c}"
+        for flag, single, a, b, c in zip(use_single, singles, first, second, third)
+    ]
+
+
 def generate_song_title() -> str:
     """Generate a random song title."""
-    if random.random() < 0.4:
-        return random.choice(TITLE_SINGLE)
-    else:
-        return " ".join(random.choice(part) for part in TITLE_PARTS)
+    return generate_song_titles_batch(1)[0]
+
+
+# Per-profile (low, high) bounds to create natural feature correlations;
+# columns: energy, danceability, acousticness, valence, instrumentalness,
+# loudness. Row order: energetic, chill, acoustic, electronic, balanced.
+PROFILE_BOUNDS = np.array([
+    [(0.6, 1.0), (0.5, 1.0), (0.0, 0.3), (0.4, 1.0), (0.0, 0.5), (0.5, 0.9)],
+    [(0.1, 0.4), (0.2, 0.6), (0.3, 0.8), (0.3, 0.7), (0.2, 0.7), (0.2, 0.5)],
+    [(0.2, 0.6), (0.2, 0.5), (0.7, 1.0), (0.2, 0.8), (0.1, 0.6), (0.2, 0.5)],
+    [(0.5, 0.9), (0.6, 1.0), (0.0, 0.2), (0.3, 0.8), (0.4, 0.9), (0.5, 0.8)],
+    [(0.3, 0.7), (0.3, 0.7), (0.2, 0.6), (0.3, 0.7), (0.2, 0.6), (0.3, 0.6)],
+])
+
+PROFILE_BPM_BOUNDS = np.array([
+    (110, 180), (60, 100), (70, 130), (100, 150), (80, 140)
+])
+
+KEY_NAMES = np.array(
+    ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"],
+    dtype=object
+)
+SCALE_NAMES = np.array(["major", "minor"], dtype=object)
 
 
-def generate_synthetic_features() -> dict:
-    """Generate realistic random audio features."""
-    # Generate base profile (to create natural correlations)
-    profile = random.choice(["energetic", "chill", "acoustic", "electronic", "balanced"])
-
-    if profile == "energetic":
-        energy = random.uniform(0.6, 1.0)
-        danceability = random.uniform(0.5, 1.0)
-        valence = random.uniform(0.4, 1.0)
-        acousticness = random.uniform(0.0, 0.3)
-        instrumentalness = random.uniform(0.0, 0.5)
-        loudness = random.uniform(0.5, 0.9)
-        bpm = random.uniform(110, 180)
-    elif profile == "chill":
-        energy = random.uniform(0.1, 0.4)
-        danceability = random.uniform(0.2, 0.6)
-        valence = random.uniform(0.3, 0.7)
-        acousticness = random.uniform(0.3, 0.8)
-        instrumentalness = random.uniform(0.2, 0.7)
-        loudness = random.uniform(0.2, 0.5)
-        bpm = random.uniform(60, 100)
-    elif profile == "acoustic":
-        energy = random.uniform(0.2, 0.6)
-        danceability = random.uniform(0.2, 0.5)
-        valence = random.uniform(0.2, 0.8)
-        acousticness = random.uniform(0.7, 1.0)
-        instrumentalness = random.uniform(0.1, 0.6)
-        loudness = random.uniform(0.2, 0.5)
-        bpm = random.uniform(70, 130)
-    elif profile == "electronic":
-        energy = random.uniform(0.5, 0.9)
-        danceability = random.uniform(0.6, 1.0)
-        valence = random.uniform(0.3, 0.8)
-        acousticness = random.uniform(0.0, 0.2)
-        instrumentalness = random.uniform(0.4, 0.9)
-        loudness = random.uniform(0.5, 0.8)
-        bpm = random.uniform(100, 150)
-    else:  # balanced
-        energy = random.uniform(0.3, 0.7)
-        danceability = random.uniform(0.3, 0.7)
-        valence = random.uniform(0.3, 0.7)
-        acousticness = random.uniform(0.2, 0.6)
-        instrumentalness = random.uniform(0.2, 0.6)
-        loudness = random.uniform(0.3, 0.6)
-        bpm = random.uniform(80, 140)
+def generate_synthetic_features_batch(n_songs: int) -> list[dict]:
+    """Generate realistic random audio features for n_songs at once.
+
+    All sampling runs in a handful of vectorized draws — one profile
+    pick per song, one uniform draw per feature column, one noise pass —
+    instead of ~8 Python-level random calls per song.
+    """
+    rng = np.random.default_rng()
+
+    profiles = rng.integers(0, len(PROFILE_BOUNDS), size=n_songs)
+    bounds = PROFILE_BOUNDS[profiles]
+    feats = rng.uniform(bounds[:, :, 0], bounds[:, :, 1])
 
     # Add some noise for variety
-    def add_noise(val, noise=0.1):
-        return max(0.0, min(1.0, val + random.uniform(-noise, noise)))
-
-    return {
-        "bpm": round(bpm, 1),
-        "key": random.choice(["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]),
-        "scale": random.choice(["major", "minor"]),
-        "energy": round(add_noise(energy), 3),
-        "danceability": round(add_noise(danceability), 3),
-        "acousticness": round(add_noise(acousticness), 3),
-        "valence": round(add_noise(valence), 3),
-        "instrumentalness": round(add_noise(instrumentalness), 3),
-        "loudness": round(add_noise(loudness), 3),
-    }
+    feats += rng.uniform(-0.1, 0.1, feats.shape)
+    np.clip(feats, 0.0, 1.0, out=feats)
+    rows = np.round(feats, 3).tolist()
+
+    bpm_bounds = PROFILE_BPM_BOUNDS[profiles]
+    bpms = np.round(rng.uniform(bpm_bounds[:, 0], bpm_bounds[:, 1]), 1).tolist()
+    keys = rng.choice(KEY_NAMES, size=n_songs).tolist()
+    scales = rng.choice(SCALE_NAMES, size=n_songs).tolist()
+
+    return [
+        {
+            "bpm": bpm,
+            "key": key,
+            "scale": scale,
+            "energy": row[0],
+            "danceability": row[1],
+            "acousticness": row[2],
+            "valence": row[3],
+            "instrumentalness": row[4],
+            "loudness": row[5],
+        }
+        for bpm, key, scale, row in zip(bpms, keys, scales, rows)
+    ]
+
+
+def generate_synthetic_features() -> dict:
+    """Generate realistic random audio features for a single song."""
+    return generate_synthetic_features_batch(1)[0]
 
 
 async def seed_songs(n_songs: int = 50):
     """Generate and save synthetic songs."""
     print(f"Generating {n_songs} synthetic songs...")
 
-    for i in range(n_songs):
-        features = generate_synthetic_features()
+    # One vectorized pass each for features, titles, and artists
+    features_list = generate_synthetic_features_batch(n_songs)
+    titles = generate_song_titles_batch(n_songs)
+    artists = np.random.default_rng().choice(ARTISTS_ARR, size=n_songs).tolist()
 
-        song = Song(
-            title=generate_song_title(),
-            artist=random.choice(ARTISTS),
+    songs = [
+        Song(
+            title=title,
+            artist=artist,
             file_path=f"synthetic/song_{i+1}.mp3",
             **features
         )
+        for i, (title, artist, features)
+        in enumerate(zip(titles, artists, features_list))
+    ]
 
-        await save_song_features(song)
-
-        if (i + 1) % 10 == 0:
-            print(f"  Created {i + 1} songs...")
+    # Insert in chunks so each chunk is one transaction instead of one
+    # commit per song
+    for start in range(0, len(songs), 1000):
+        chunk = songs[start:start + 1000]
+        await save_songs_bulk(chunk)
+        print(f"  Created {start + len(chunk)} songs...")
 
     print(f"Created {n_songs} songs successfully!")
 
@@ -162,24 +195,11 @@ async def run_clustering(n_clusters: int = 8):
         print("No songs found in database!")
         return
 
-    # Build features DataFrame
-    features_data = []
-    for song in songs:
-        features_data.append({
-            "id": song.id,
-            "bpm_normalized": song.bpm / 200.0,
-            "energy": song.energy,
-            "danceability": song.danceability,
-            "acousticness": song.acousticness,
-            "valence": song.valence,
-            "instrumentalness": song.instrumentalness,
-            "loudness": song.loudness,
-        })
-
-    df = pd.DataFrame(features_data)
+    # One contiguous float32 matrix, no per-song dicts or DataFrame
+    X = Song.feature_matrix(songs)
 
     # Train clustering model
-    model, silhouette = train_clusters(df, n_clusters)
+    model, silhouette = train_clusters(X, n_clusters)
     print(f"Clustering complete! Silhouette score: {silhouette:.3f}")
 
     # Get centroids
@@ -202,34 +222,50 @@ async def run_clustering(n_clusters: int = 8):
         cluster_id_map[cluster_idx] = db_cluster_id
         print(f"  Cluster {db_cluster_id}: {description}")
 
-    # Assign songs to clusters
+    # Assign songs to clusters in one executemany transaction
     labels = model.labels_
-    cluster_counts = {}
+    pairs = [
+        (song.id, cluster_id_map[labels[i]])
+        for i, song in enumerate(songs)
+    ]
+    await bulk_update_song_cluster(pairs)
 
-    for i, song in enumerate(songs):
-        cluster_idx = labels[i]
-        db_cluster_id = cluster_id_map[cluster_idx]
-
-        await update_song_cluster(song.id, db_cluster_id)
+    cluster_counts = {}
+    for _, db_cluster_id in pairs:
         cluster_counts[db_cluster_id] = cluster_counts.get(db_cluster_id, 0) + 1
 
-    # Update cluster song counts
-    for db_cluster_id, count in cluster_counts.items():
-        cluster = Cluster(id=db_cluster_id, song_count=count)
-        # Re-fetch to get centroid data
-        from app.db import get_cluster_by_id
-        existing = await get_cluster_by_id(db_cluster_id)
-        if existing:
-            existing.song_count = count
-            await save_cluster(existing)
+    # One correlated UPDATE recomputes every cluster's song count
+    await update_cluster_counts()
 
     print(f"\nAssigned songs to clusters:")
     for cluster_id, count in sorted(cluster_counts.items()):
         print(f"  Cluster {cluster_id}: {count} songs")
 
 
+async def main_programmatic(
+    n_songs: int = 50,
+    n_clusters: int = 8,
+    skip_songs: bool = False
+):
+    """Seed end-to-end from an existing event loop (used by the CLI)."""
+    try:
+        print("Initializing database...")
+        await init_db()
+
+        if not skip_songs:
+            await seed_songs(n_songs)
+
+        await run_clustering(n_clusters)
+
+        print("\nSeeding complete!")
+    finally:
+        # The shared aiosqlite connection owns a non-daemon worker
+        # thread; close it so the process can exit
+        await close_db()
+
+
 async def main():
-    """Main entry point."""
+    """Command-line entry point."""
     import argparse
 
     parser = argparse.ArgumentParser(description="Seed database with sample data")
@@ -239,16 +275,15 @@ async def main():
 
     args = parser.parse_args()
 
-    print("Initializing database...")
-    await init_db()
-
-    if not args.skip_songs:
-        await seed_songs(args.songs)
-
-    await run_clustering(args.clusters)
-
-    print("\nSeeding complete!")
+    await main_programmatic(args.songs, args.clusters, skip_songs=args.skip_songs)
 
 
 if __name__ == "__main__":
+    # Use the libuv event loop when available (matches cli.main)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())